@@ -4,12 +4,14 @@ Módulo core - Infraestrutura fundamental do sistema.
 Este módulo contém:
 - Decoradores (Singleton, Retry)
 - Sistema de logging
+- Carregamento de configuração
 - Cliente MT5 com reconexão automática
 - Cliente Telegram (Novo)
 """
 
 from core.decorators import singleton, retry_with_backoff, measure_time
 from core.logger import get_logger, configure_logging_from_config, LoggerManager
+from core.config import load_config
 from core.mt5_client import MT5Client
 from core.telegram import TelegramBot
 
@@ -24,6 +26,9 @@ __all__ = [
     'configure_logging_from_config',
     'LoggerManager',
     
+    # Config
+    'load_config',
+    
     # MT5
     'MT5Client',
     
@@ -0,0 +1,53 @@
+"""
+Carregamento centralizado do arquivo de configuração JSON.
+
+Este módulo concentra a leitura do settings.json usada pelo
+orquestrador, pelo sistema de logging e pelo script de treino,
+utilizando o parser orjson (C/SIMD) quando disponível e caindo
+para o json da biblioteca padrão caso contrário.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # Dependência opcional
+    orjson = None
+
+
+def parse_json_bytes(raw: bytes) -> Any:
+    """
+    Decodifica conteúdo JSON bruto.
+
+    Args:
+        raw: Bytes do documento JSON
+
+    Returns:
+        Objeto Python decodificado
+
+    Raises:
+        json.JSONDecodeError: Se o conteúdo não for JSON válido
+            (orjson.JSONDecodeError é subclasse desta exceção)
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def load_config(config_path: Union[str, Path] = "config/settings.json") -> Dict[str, Any]:
+    """
+    Carrega o arquivo de configuração do sistema.
+
+    Args:
+        config_path: Caminho para o arquivo de configuração
+
+    Returns:
+        Dicionário com as configurações
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        json.JSONDecodeError: Se o arquivo não for JSON válido
+    """
+    return parse_json_bytes(Path(config_path).read_bytes())
@@ -8,6 +8,7 @@ implementação do padrão Singleton para recursos compartilhados.
 
 import asyncio
 import functools
+import logging
 import time
 from typing import Callable, TypeVar, Any, Optional
 from core.logger import get_logger
@@ -36,14 +37,15 @@ def singleton(cls: type[T]) -> type[T]:
         >>> class DatabaseConnection:
         ...     pass
     """
-    instances = {}
+    instance: Optional[T] = None
     
     @functools.wraps(cls)
     def get_instance(*args: Any, **kwargs: Any) -> T:
-        if cls not in instances:
+        nonlocal instance
+        if instance is None:
             logger.info(f"Criando instância Singleton de {cls.__name__}")
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+            instance = cls(*args, **kwargs)
+        return instance
     
     return get_instance
 
@@ -196,9 +198,13 @@ def measure_time(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-        start_time = time.time()
+        # Sem DEBUG ativo não há o que registrar: evita medição e formatação
+        if not logger.isEnabledFor(logging.DEBUG):
+            return await func(*args, **kwargs)
+        
+        start_time = time.perf_counter()
         result = await func(*args, **kwargs)
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         
         logger.debug(
             f"⏱ {func.__name__} executado em {elapsed:.4f}s"
@@ -208,9 +214,13 @@ def measure_time(func: Callable) -> Callable:
     
     @functools.wraps(func)
     def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-        start_time = time.time()
+        # Sem DEBUG ativo não há o que registrar: evita medição e formatação
+        if not logger.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        
+        start_time = time.perf_counter()
         result = func(*args, **kwargs)
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         
         logger.debug(
             f"⏱ {func.__name__} executado em {elapsed:.4f}s"
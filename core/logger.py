@@ -6,14 +6,119 @@ Este módulo implementa um sistema de logging robusto com:
 - Formatação consistente com timestamps
 - Níveis de log configuráveis
 - Saída simultânea para console e arquivo
+- Escrita assíncrona via fila (QueueHandler/QueueListener)
 """
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
-import json
+
+from core.config import load_config
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler com buffer de escrita e flush periódico.
+    
+    O RotatingFileHandler padrão faz flush a cada registro, gerando uma
+    syscall de escrita por linha. Aqui as linhas são acumuladas em um
+    buffer e gravadas em disco a cada `flush_interval` segundos, ou
+    imediatamente para registros WARNING ou mais graves.
+    """
+    
+    def __init__(
+        self,
+        *args,
+        buffer_size: int = 65536,
+        flush_interval: float = 2.0,
+        **kwargs
+    ):
+        """
+        Args:
+            buffer_size: Tamanho do buffer de escrita em bytes
+            flush_interval: Intervalo máximo entre flushes (segundos)
+            *args, **kwargs: Repassados ao RotatingFileHandler
+        """
+        # Definidos antes do __init__ pai, que já chama _open()
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._pending_size = 0
+        
+        super().__init__(*args, **kwargs)
+        
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            name="log-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+    
+    def _open(self):
+        path = Path(self.baseFilename)
+        self._stream_size = path.stat().st_size if path.exists() else 0
+        
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        # A versão base usa stream.seek()/tell(), que forçam flush do buffer
+        # a cada registro. Aqui o tamanho do arquivo é contabilizado em memória.
+        if self.stream is None:
+            self.stream = self._open()
+        
+        if self.maxBytes <= 0:
+            return False
+        
+        msg = "%s\n" % self.format(record)
+        self._pending_size = len(msg.encode(self.encoding or "utf-8", errors="replace"))
+        
+        return self._stream_size + self._pending_size >= self.maxBytes
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        self._stream_size += self._pending_size
+        
+        # Erros e avisos vão direto para o disco
+        if record.levelno >= logging.WARNING:
+            self._flush_stream()
+    
+    def flush(self) -> None:
+        # Chamado pelo StreamHandler após cada registro: só grava
+        # quando o intervalo de flush já expirou
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_stream()
+    
+    def close(self) -> None:
+        self._stop_flusher.set()
+        self._flush_stream()
+        super().close()
+    
+    def _flush_stream(self) -> None:
+        self.acquire()
+        try:
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+    
+    def _flush_loop(self) -> None:
+        # Garante que o buffer chegue ao disco mesmo em períodos sem logs
+        while not self._stop_flusher.wait(self.flush_interval):
+            self._flush_stream()
 
 
 class LoggerManager:
@@ -26,6 +131,7 @@ class LoggerManager:
     
     _loggers: dict[str, logging.Logger] = {}
     _configured: bool = False
+    _listener: Optional[QueueListener] = None
     
     @classmethod
     def configure(
@@ -35,7 +141,9 @@ class LoggerManager:
         file: bool = True,
         log_dir: str = "logs",
         max_bytes: int = 10485760,  # 10MB
-        backup_count: int = 5
+        backup_count: int = 5,
+        buffer_size: int = 65536,  # 64KB
+        flush_interval: float = 2.0
     ) -> None:
         """
         Configura o sistema de logging global.
@@ -47,6 +155,8 @@ class LoggerManager:
             log_dir: Diretório para armazenar arquivos de log
             max_bytes: Tamanho máximo de cada arquivo de log
             backup_count: Número de arquivos de backup a manter
+            buffer_size: Tamanho do buffer de escrita do arquivo (bytes)
+            flush_interval: Intervalo máximo entre gravações em disco (segundos)
         """
         if cls._configured:
             return
@@ -64,6 +174,13 @@ class LoggerManager:
         
         formatter = logging.Formatter(log_format, datefmt=date_format)
         
+        # O formato não usa thread/processo/task: dispensa coletá-los em
+        # cada LogRecord (funcName continua exigindo a inspeção de frames)
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+        logging.logAsyncioTasks = False
+        
         # Configura handler para console
         handlers = []
         
@@ -74,11 +191,13 @@ class LoggerManager:
         
         # Configura handler para arquivo rotativo
         if file:
-            file_handler = RotatingFileHandler(
+            file_handler = BufferedRotatingFileHandler(
                 filename=log_path / "trading_bot.log",
                 maxBytes=max_bytes,
                 backupCount=backup_count,
-                encoding='utf-8'
+                encoding='utf-8',
+                buffer_size=buffer_size,
+                flush_interval=flush_interval
             )
             file_handler.setFormatter(formatter)
             handlers.append(file_handler)
@@ -90,9 +209,17 @@ class LoggerManager:
         # Remove handlers existentes para evitar duplicação
         root_logger.handlers.clear()
         
-        # Adiciona handlers configurados
-        for handler in handlers:
-            root_logger.addHandler(handler)
+        # Handlers reais rodam na thread do QueueListener: o loop de trading
+        # apenas enfileira o registro, sem bloquear em escrita/rotação de disco
+        if handlers:
+            log_queue: queue.Queue = queue.Queue(-1)
+            cls._listener = QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+            
+            root_logger.addHandler(QueueHandler(log_queue))
         
         cls._configured = True
         
@@ -104,6 +231,17 @@ class LoggerManager:
         root_logger.info(f"Diretório: {log_path.absolute()}")
         root_logger.info("=" * 80)
     
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Esvazia a fila de logs e encerra a thread de escrita.
+        
+        Registrado em atexit; pode ser chamado manualmente com segurança.
+        """
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+    
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """
@@ -148,8 +286,7 @@ def configure_logging_from_config(config_path: str = "config/settings.json") ->
         config_path: Caminho para arquivo de configuração
     """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = load_config(config_path)
         
         log_config = config.get('logging', {})
         
@@ -159,7 +296,9 @@ def configure_logging_from_config(config_path: str = "config/settings.json") ->
             file=log_config.get('file', True),
             log_dir=log_config.get('log_dir', 'logs'),
             max_bytes=log_config.get('max_bytes', 10485760),
-            backup_count=log_config.get('backup_count', 5)
+            backup_count=log_config.get('backup_count', 5),
+            buffer_size=log_config.get('buffer_size', 65536),
+            flush_interval=log_config.get('flush_interval', 2.0)
         )
     except Exception as e:
         # Fallback para configuração padrão em caso de erro
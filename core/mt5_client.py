@@ -8,11 +8,15 @@ caso de falhas de rede ou desconexões.
 
 import MetaTrader5 as mt5
 import asyncio
-from typing import Optional, Dict, Any, List
+import logging
+import time
+from collections import Counter
+from typing import Optional, Dict, Any, List, Tuple, Set
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
-from core.decorators import singleton, retry_with_backoff
+from core.decorators import singleton
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,6 +39,47 @@ class MT5Client:
         connected: Status da conexão
     """
     
+    __slots__ = (
+        'login', 'password', 'server', 'timeout', 'path', 'connected',
+        '_last_check', '_tick_cache', '_selected_symbols', '_symbol_cache'
+    )
+    
+    # Política de retry da conexão (backoff exponencial)
+    _CONNECT_ATTEMPTS = 5
+    _CONNECT_BASE_DELAY = 2.0
+    _CONNECT_MAX_DELAY = 60.0
+    
+    # Trechos de mensagens de erro que indicam credenciais inválidas
+    _AUTH_MARKERS = ('authorization', 'authentication', 'invalid account', 'invalid password')
+    
+    # Validade (segundos) da última verificação bem-sucedida do terminal.
+    # Falhas de IPC derrubam a conexão na hora (ver last_error); a sondagem
+    # periódica é apenas rede de segurança para quedas silenciosas
+    _CHECK_TTL = 30.0
+    
+    # Idade máxima (segundos) das informações de símbolo em cache.
+    # trade_tick_value/spread variam com o mercado; point, digits, limites de
+    # volume e filling_mode só mudam por decisão do broker
+    SYMBOL_INFO_TTL = 5.0
+    SYMBOL_STATIC_TTL = 3600.0
+    
+    # Códigos de erro de comunicação (IPC) com o terminal
+    # (RES_E_INTERNAL_FAIL_SEND/RECEIVE/INIT/CONNECT/TIMEOUT)
+    _IPC_ERRORS = frozenset((-10001, -10002, -10003, -10004, -10005))
+    
+    # Mapeia string de timeframe para constante MT5
+    _TIMEFRAME_MAP = {
+        'M1': mt5.TIMEFRAME_M1,
+        'M5': mt5.TIMEFRAME_M5,
+        'M15': mt5.TIMEFRAME_M15,
+        'M30': mt5.TIMEFRAME_M30,
+        'H1': mt5.TIMEFRAME_H1,
+        'H4': mt5.TIMEFRAME_H4,
+        'D1': mt5.TIMEFRAME_D1,
+        'W1': mt5.TIMEFRAME_W1,
+        'MN1': mt5.TIMEFRAME_MN1
+    }
+    
     def __init__(
         self,
         login: int,
@@ -59,22 +104,26 @@ class MT5Client:
         self.timeout = timeout
         self.path = path
         self.connected = False
+        self._last_check = 0.0
+        
+        # Último tick por símbolo: (instante monotônico, tick)
+        self._tick_cache: Dict[str, Tuple[float, Any]] = {}
+        
+        # Símbolos já adicionados ao Market Watch nesta sessão do terminal
+        self._selected_symbols: Set[str] = set()
+        
+        # Informações por símbolo: (instante monotônico, dicionário)
+        self._symbol_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         
         logger.info(f"MT5Client inicializado - Login: {login}, Server: {server}")
     
-    @retry_with_backoff(
-        max_attempts=5,
-        base_delay=2.0,
-        max_delay=60.0,
-        exponential=True,
-        exceptions=(Exception,)
-    )
     async def connect(self) -> bool:
         """
         Estabelece conexão com MetaTrader 5.
         
         Implementa retry automático com backoff exponencial
-        para lidar com falhas temporárias de conexão.
+        para lidar com falhas temporárias de conexão. Falhas de
+        autenticação não são retentadas.
         
         Returns:
             True se conectado com sucesso, False caso contrário
@@ -86,6 +135,44 @@ class MT5Client:
             logger.debug("Já conectado ao MT5")
             return True
         
+        for attempt in range(1, self._CONNECT_ATTEMPTS + 1):
+            try:
+                result = self._initialize()
+                
+                if attempt > 1:
+                    logger.info(f"✓ Sucesso após {attempt} tentativa(s) - connect")
+                
+                return result
+            
+            except Exception as e:
+                msg = str(e).casefold()
+                
+                if any(marker in msg for marker in self._AUTH_MARKERS):
+                    logger.error(f"✗ Falha de autenticação no MT5, abortando retry: {e}")
+                    raise
+                
+                if attempt == self._CONNECT_ATTEMPTS:
+                    logger.error(
+                        f"✗ Falha definitiva após {self._CONNECT_ATTEMPTS} tentativas - connect: {e}"
+                    )
+                    raise
+                
+                delay = min(self._CONNECT_BASE_DELAY * (2 ** (attempt - 1)), self._CONNECT_MAX_DELAY)
+                logger.warning(
+                    f"⚠ Tentativa {attempt} falhou - connect: {e}. "
+                    f"Aguardando {delay:.1f}s antes de retry..."
+                )
+                await asyncio.sleep(delay)
+        
+        return False
+    
+    def _initialize(self) -> bool:
+        """
+        Executa uma tentativa de inicialização e validação do terminal.
+        
+        Raises:
+            ConnectionError: Se o terminal não inicializar ou não responder
+        """
         # Inicializa terminal MT5
         if self.path:
             initialized = mt5.initialize(
@@ -121,6 +208,10 @@ class MT5Client:
             raise ConnectionError(error_msg)
         
         self.connected = True
+        self._last_check = time.monotonic()
+        # Nova sessão do terminal: o Market Watch precisa ser refeito
+        self._selected_symbols.clear()
+        self._symbol_cache.clear()
         
         logger.info("=" * 80)
         logger.info("✓ Conexão MT5 Estabelecida com Sucesso")
@@ -147,14 +238,44 @@ class MT5Client:
         """
         Garante que a conexão está ativa, reconectando se necessário.
         
+        A conexão é considerada ativa até que uma chamada falhe com
+        erro de IPC (ver last_error); uma verificação bem-sucedida do
+        terminal é reaproveitada por _CHECK_TTL segundos, evitando uma
+        chamada IPC (terminal_info) a cada consulta.
+        
         Returns:
             True se conectado, False caso contrário
         """
+        now = time.monotonic()
+        if self.connected and now - self._last_check < self._CHECK_TTL:
+            return True
+        
         if not self.connected or mt5.terminal_info() is None:
             logger.warning("Conexão perdida. Tentando reconectar...")
             return await self.connect()
+        
+        self._last_check = now
         return True
     
+    def last_error(self) -> Any:
+        """
+        Retorna o último erro do MT5.
+        
+        Falhas de comunicação (IPC) com o terminal marcam a conexão
+        como perdida, de modo que a próxima chamada a ensure_connected
+        reconecta imediatamente.
+        
+        Returns:
+            Tupla (código, descrição) retornada por mt5.last_error()
+        """
+        error = mt5.last_error()
+        
+        if error and error[0] in self._IPC_ERRORS and self.connected:
+            logger.warning(f"Falha de comunicação com o terminal MT5: {error}")
+            self.connected = False
+        
+        return error
+    
     async def get_account_info(self) -> Optional[Dict[str, Any]]:
         """
         Obtém informações da conta de trading.
@@ -166,7 +287,7 @@ class MT5Client:
         
         account_info = mt5.account_info()
         if account_info is None:
-            logger.error(f"Erro ao obter informações da conta: {mt5.last_error()}")
+            logger.error(f"Erro ao obter informações da conta: {self.last_error()}")
             return None
         
         return {
@@ -182,29 +303,49 @@ class MT5Client:
             'leverage': account_info.leverage
         }
     
-    async def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+    async def get_symbol_info(
+        self,
+        symbol: str,
+        max_age: float = SYMBOL_INFO_TTL
+    ) -> Optional[Dict[str, Any]]:
         """
         Obtém informações detalhadas de um símbolo.
         
+        Informações obtidas há menos de `max_age` segundos são
+        reaproveitadas. Quem só precisa dos campos estáticos (point,
+        digits, volumes, filling_mode) pode usar SYMBOL_STATIC_TTL.
+        
         Args:
             symbol: Nome do símbolo (ex: "EURUSD")
+            max_age: Idade máxima aceitável em cache (0 força consulta)
             
         Returns:
-            Dicionário com informações do símbolo ou None
+            Dicionário com informações do símbolo ou None (não deve
+            ser modificado: é compartilhado com o cache)
         """
+        now = time.monotonic()
+        cached = self._symbol_cache.get(symbol)
+        
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
+        
         await self.ensure_connected()
         
-        # Seleciona símbolo no Market Watch
-        if not mt5.symbol_select(symbol, True):
-            logger.error(f"Falha ao selecionar símbolo {symbol}: {mt5.last_error()}")
-            return None
+        # Seleciona símbolo no Market Watch (uma vez por sessão do terminal)
+        if symbol not in self._selected_symbols:
+            if not mt5.symbol_select(symbol, True):
+                logger.error(f"Falha ao selecionar símbolo {symbol}: {self.last_error()}")
+                return None
+            self._selected_symbols.add(symbol)
         
         symbol_info = mt5.symbol_info(symbol)
         if symbol_info is None:
-            logger.error(f"Erro ao obter informações de {symbol}: {mt5.last_error()}")
+            # Pode ter sido removido do Market Watch: seleciona de novo na próxima
+            self._selected_symbols.discard(symbol)
+            logger.error(f"Erro ao obter informações de {symbol}: {self.last_error()}")
             return None
         
-        return {
+        info = {
             'symbol': symbol_info.name,
             'bid': symbol_info.bid,
             'ask': symbol_info.ask,
@@ -219,15 +360,48 @@ class MT5Client:
             'filling_mode': symbol_info.filling_mode,
             'trade_contract_size': symbol_info.trade_contract_size
         }
+        
+        self._symbol_cache[symbol] = (now, info)
+        return info
     
-    async def get_rates(
+    async def get_tick(self, symbol: str, max_age: float = 0.1) -> Optional[Any]:
+        """
+        Obtém o último tick (bid/ask) de um símbolo.
+        
+        Ticks obtidos há menos de `max_age` segundos são reaproveitados,
+        evitando chamadas IPC repetidas dentro da mesma execução.
+        
+        Args:
+            symbol: Nome do símbolo
+            max_age: Idade máxima aceitável do tick em cache (0 força consulta)
+            
+        Returns:
+            Tick do MT5 (atributos bid, ask, time_msc...) ou None
+        """
+        now = time.monotonic()
+        cached = self._tick_cache.get(symbol)
+        
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
+        
+        await self.ensure_connected()
+        
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            logger.error(f"Erro ao obter tick de {symbol}: {self.last_error()}")
+            return None
+        
+        self._tick_cache[symbol] = (now, tick)
+        return tick
+    
+    async def get_rates_array(
         self,
         symbol: str,
         timeframe: str,
         count: int = 500
-    ) -> Optional[pd.DataFrame]:
+    ) -> Optional[np.ndarray]:
         """
-        Obtém dados históricos de preços.
+        Obtém dados históricos de preços no formato bruto do MT5.
         
         Args:
             symbol: Nome do símbolo
@@ -235,24 +409,12 @@ class MT5Client:
             count: Número de barras a obter
             
         Returns:
-            DataFrame com OHLCV ou None em caso de erro
+            Array estruturado (time, open, high, low, close, tick_volume,
+            spread, real_volume) ou None em caso de erro
         """
         await self.ensure_connected()
         
-        # Mapeia string de timeframe para constante MT5
-        timeframe_map = {
-            'M1': mt5.TIMEFRAME_M1,
-            'M5': mt5.TIMEFRAME_M5,
-            'M15': mt5.TIMEFRAME_M15,
-            'M30': mt5.TIMEFRAME_M30,
-            'H1': mt5.TIMEFRAME_H1,
-            'H4': mt5.TIMEFRAME_H4,
-            'D1': mt5.TIMEFRAME_D1,
-            'W1': mt5.TIMEFRAME_W1,
-            'MN1': mt5.TIMEFRAME_MN1
-        }
-        
-        tf = timeframe_map.get(timeframe)
+        tf = self._TIMEFRAME_MAP.get(timeframe)
         if tf is None:
             logger.error(f"Timeframe inválido: {timeframe}")
             return None
@@ -261,7 +423,68 @@ class MT5Client:
         rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
         
         if rates is None or len(rates) == 0:
-            logger.error(f"Erro ao obter dados de {symbol}: {mt5.last_error()}")
+            logger.error(f"Erro ao obter dados de {symbol}: {self.last_error()}")
+            return None
+        
+        return rates
+    
+    async def get_rates_batch(
+        self,
+        counts: Dict[str, int],
+        timeframe: str
+    ) -> Dict[str, Optional[np.ndarray]]:
+        """
+        Obtém dados históricos de vários símbolos em uma única passada.
+        
+        O módulo MetaTrader5 mantém uma única conexão IPC com o terminal
+        e não é thread-safe: as chamadas copy_rates_from_pos são feitas
+        em sequência, na mesma thread, e o erro de cada falha é lido
+        logo após a chamada que o produziu (mt5.last_error() é global).
+        
+        Args:
+            counts: Número de barras a obter por símbolo
+            timeframe: Timeframe (ex: "H1", "M15", "D1")
+            
+        Returns:
+            Dicionário símbolo -> array estruturado (ou None em caso de erro)
+        """
+        await self.ensure_connected()
+        
+        tf = self._TIMEFRAME_MAP.get(timeframe)
+        if tf is None:
+            logger.error(f"Timeframe inválido: {timeframe}")
+            return {symbol: None for symbol in counts}
+        
+        batch: Dict[str, Optional[np.ndarray]] = {}
+        for symbol, count in counts.items():
+            rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
+            if rates is None or len(rates) == 0:
+                logger.error(f"Erro ao obter dados de {symbol}: {self.last_error()}")
+                rates = None
+            batch[symbol] = rates
+        
+        return batch
+    
+    async def get_rates(
+        self,
+        symbol: str,
+        timeframe: str,
+        count: int = 500
+    ) -> Optional[pd.DataFrame]:
+        """
+        Obtém dados históricos de preços.
+        
+        Args:
+            symbol: Nome do símbolo
+            timeframe: Timeframe (ex: "H1", "M15", "D1")
+            count: Número de barras a obter
+            
+        Returns:
+            DataFrame com OHLCV ou None em caso de erro
+        """
+        rates = await self.get_rates_array(symbol, timeframe, count)
+        
+        if rates is None:
             return None
         
         # Converte para DataFrame
@@ -269,7 +492,8 @@ class MT5Client:
         df['time'] = pd.to_datetime(df['time'], unit='s')
         df.set_index('time', inplace=True)
         
-        logger.debug(f"Obtidos {len(df)} barras de {symbol} {timeframe}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Obtidos {len(df)} barras de {symbol} {timeframe}")
         
         return df
     
@@ -291,6 +515,7 @@ class MT5Client:
             positions = mt5.positions_get()
         
         if positions is None:
+            self.last_error()
             logger.debug("Nenhuma posição aberta")
             return []
         
@@ -312,6 +537,46 @@ class MT5Client:
         
         return position_list
     
+    async def get_position_counts(self) -> Dict[str, int]:
+        """
+        Conta as posições abertas por símbolo.
+        
+        Versão leve de get_positions para o loop de trading: lê apenas
+        o atributo symbol de cada posição, sem montar dicionários.
+        
+        Returns:
+            Dicionário símbolo -> número de posições abertas
+        """
+        await self.ensure_connected()
+        
+        positions = mt5.positions_get()
+        
+        if positions is None:
+            self.last_error()
+            return {}
+        
+        return Counter(pos.symbol for pos in positions)
+    
+    async def get_positions_snapshot(self) -> Tuple[Dict[str, int], Dict[int, Tuple[float, float]]]:
+        """
+        Lê as posições abertas uma única vez para o loop de trading.
+        
+        Returns:
+            Tupla (posições por símbolo, (sl, tp) por ticket); ambos
+            vazios se a consulta falhar
+        """
+        await self.ensure_connected()
+        
+        positions = mt5.positions_get()
+        
+        if positions is None:
+            self.last_error()
+            return {}, {}
+        
+        counts = Counter(pos.symbol for pos in positions)
+        sltp = {pos.ticket: (pos.sl, pos.tp) for pos in positions}
+        return counts, sltp
+    
     async def check_connection(self) -> bool:
         """
         Verifica status da conexão.
@@ -6,7 +6,7 @@ Inclui rotinas avançadas e dinâmicas de fechamento de ordens para MT5.
 import aiohttp
 import asyncio
 import MetaTrader5 as mt5
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +14,40 @@ logger = get_logger(__name__)
 class TelegramBot:
     """Cliente para interação via Telegram Bot API."""
     
+    __slots__ = (
+        'token', 'chat_id', 'enabled', 'running', 'alerts_muted', 'base_url',
+        '_send_url', 'last_update_id', '_outbox', '_outbox_task', '_session'
+    )
+    
+    # Conexões mantidas abertas (keep-alive) com api.telegram.org
+    POOL_SIZE = 4
+    
+    # Capacidade da fila de saída: com a API lenta ou fora do ar, novos
+    # alertas são descartados em vez de acumular memória indefinidamente
+    OUTBOX_SIZE = 256
+    
+    # Alertas enfileirados dentro desta janela (segundos) saem em um único
+    # sendMessage; o tamanho do lote respeita o limite de 4096 caracteres
+    # da API (com margem para emojis, contados em UTF-16 pelo Telegram)
+    COALESCE_WINDOW = 1.0
+    MAX_MESSAGE_LENGTH = 4000
+    BATCH_SEPARATOR = "\n\n———\n\n"
+    
+    # Respostas fixas (montadas uma única vez)
+    HELP_MESSAGE = (
+        "🤖 <b>Painel de Controle:</b>\n\n"
+        "💰 /saldo - Ver saldo e lucro\n"
+        "📊 /status - Ver negociações abertas\n"
+        "🛑 /fechar EURUSD - Encerrar negociação\n"
+        "💥 /fechar_todas - Fechar TODAS as posições\n"
+        "🔕 /parar - Mutar alertas\n"
+        "🔔 /retomar - Desmutar alertas"
+    )
+    DISCONNECTED_MESSAGE = "⚠️ MT5 Desconectado."
+    
+    # Linha do /status por posição (preenchida via format_map)
+    STATUS_LINE = "🔸 <b>{symbol}</b> | {action} | {volume} Lotes\n   Lucro Atual: ${profit:.2f}\n\n"
+    
     def __init__(self, token: str, chat_id: str, enabled: bool = True):
         self.token = token
         self.chat_id = str(chat_id)
@@ -21,7 +55,14 @@ class TelegramBot:
         self.running = False
         self.alerts_muted = False
         self.base_url = f"https://api.telegram.org/bot{token}"
+        # URL de envio montada uma vez (usada a cada mensagem)
+        self._send_url = f"{self.base_url}/sendMessage"
         self.last_update_id = 0
+        # Fila de saída: alertas são enviados em background, fora do caminho de execução
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=self.OUTBOX_SIZE)
+        self._outbox_task: Optional[asyncio.Task] = None
+        # Sessão HTTP única (criada no primeiro uso, dentro do event loop)
+        self._session: Optional[aiohttp.ClientSession] = None
         
         if enabled and token and chat_id:
             logger.info(f"TelegramBot configurado para Chat ID: {chat_id}")
@@ -34,34 +75,104 @@ class TelegramBot:
         self.running = True
         logger.info("Telegram: Iniciando serviço de escuta em background...")
         
-        async with aiohttp.ClientSession() as session:
-            while self.running:
+        while self.running:
+            try:
+                payload = {"offset": self.last_update_id + 1, "timeout": 1, "allowed_updates": ["message"]}
                 try:
-                    payload = {"offset": self.last_update_id + 1, "timeout": 1, "allowed_updates": ["message"]}
-                    try:
-                        async with session.post(f"{self.base_url}/getUpdates", json=payload, timeout=5) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                if data.get("ok"):
-                                    for update in data.get("result", []):
-                                        self.last_update_id = update["update_id"]
-                                        if "message" in update:
-                                            await self._handle_message(update["message"], mt5_client)
-                    except asyncio.TimeoutError:
-                        pass
-                    except Exception as e:
-                        logger.debug(f"Erro de conexão Telegram: {e}")
-                        await asyncio.sleep(5)
-                    await asyncio.sleep(0.5)
-                except asyncio.CancelledError:
-                    break
+                    async with self._get_session().post(f"{self.base_url}/getUpdates", json=payload, timeout=5) as response:
+                        if response.status == 200:
+                            data = await response.json()
+                            if data.get("ok"):
+                                for update in data.get("result", []):
+                                    self.last_update_id = update["update_id"]
+                                    if "message" in update:
+                                        await self._handle_message(update["message"], mt5_client)
+                except asyncio.TimeoutError:
+                    pass
                 except Exception as e:
-                    logger.error(f"Erro crítico no Telegram: {e}")
+                    logger.debug(f"Erro de conexão Telegram: {e}")
                     await asyncio.sleep(5)
+                await asyncio.sleep(0.5)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Erro crítico no Telegram: {e}")
+                await asyncio.sleep(5)
 
     def stop(self):
         self.running = False
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão HTTP compartilhada, reaproveitando conexões TLS entre envios."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.POOL_SIZE),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Fecha a sessão HTTP (chamar após flush no shutdown)."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def notify(self, message: str) -> None:
+        """Enfileira uma mensagem para envio em background (não bloqueia o chamador)."""
+        if not self.enabled: return
+        if self._outbox_task is None or self._outbox_task.done():
+            self._outbox_task = asyncio.get_running_loop().create_task(self._outbox_worker())
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Telegram: fila de saída cheia, mensagem descartada")
+
+    async def _outbox_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._outbox.get()]
+            try:
+                # Agrupa o que chegar na janela (ex: várias ordens no mesmo tick)
+                deadline = loop.time() + self.COALESCE_WINDOW
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._outbox.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                for text in self._coalesce(batch):
+                    await self.send_message(text)
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
+    def _coalesce(self, messages: List[str]) -> List[str]:
+        """Une mensagens consecutivas em textos de até MAX_MESSAGE_LENGTH caracteres."""
+        texts: List[str] = []
+        current = messages[0]
+        for message in messages[1:]:
+            if len(current) + len(self.BATCH_SEPARATOR) + len(message) <= self.MAX_MESSAGE_LENGTH:
+                current = f"{current}{self.BATCH_SEPARATOR}{message}"
+            else:
+                texts.append(current)
+                current = message
+        texts.append(current)
+        return texts
+
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Aguarda o envio das mensagens pendentes (até `timeout` segundos) e encerra o worker."""
+        # Assume o worker antes de aguardar: chamadas concorrentes não o encerram duas vezes
+        task, self._outbox_task = self._outbox_task, None
+        if task is None: return
+        try:
+            await asyncio.wait_for(self._outbox.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Telegram: {self._outbox.qsize()} mensagem(ns) descartada(s) no shutdown")
+        task.cancel()
+
     async def _handle_message(self, message: Dict, mt5_client: Any) -> None:
         sender_id = str(message.get("chat", {}).get("id", ""))
         text = message.get("text", "").strip().lower()
@@ -86,20 +197,12 @@ class TelegramBot:
         elif text == "/retomar":
             self.alerts_muted = False
             await self.send_message("🔔 <b>Notificações Retomadas.</b>")
-        elif text in ["/ajuda", "/start", "ajuda"]:
-            await self.send_message(
-                "🤖 <b>Painel de Controle:</b>\n\n"
-                "💰 /saldo - Ver saldo e lucro\n"
-                "📊 /status - Ver negociações abertas\n"
-                "🛑 /fechar EURUSD - Encerrar negociação\n"
-                "💥 /fechar_todas - Fechar TODAS as posições\n"
-                "🔕 /parar - Mutar alertas\n"
-                "🔔 /retomar - Desmutar alertas"
-            )
+        elif text in ("/ajuda", "/start", "ajuda"):
+            await self.send_message(self.HELP_MESSAGE)
 
     async def _reply_balance(self, mt5_client: Any) -> None:
         if not await mt5_client.ensure_connected():
-            await self.send_message("⚠️ MT5 Desconectado.")
+            await self.send_message(self.DISCONNECTED_MESSAGE)
             return
         info = await mt5_client.get_account_info()
         if info:
@@ -110,27 +213,30 @@ class TelegramBot:
 
     async def _reply_status(self, mt5_client: Any) -> None:
         if not await mt5_client.ensure_connected():
-            await self.send_message("⚠️ MT5 Desconectado.")
+            await self.send_message(self.DISCONNECTED_MESSAGE)
             return
         positions = await mt5_client.get_positions()
         if not positions:
             await self.send_message("✅ <b>Sistema Online.</b>\nNenhuma negociação aberta.")
             return
-        msg = f"📊 <b>Abertas ({len(positions)}):</b>\n\n"
+        # Partes acumuladas em lista e unidas uma única vez (sem += em loop)
+        parts = [f"📊 <b>Abertas ({len(positions)}):</b>\n\n"]
+        line = self.STATUS_LINE
         for pos in positions:
             is_dict = isinstance(pos, dict)
-            sym = pos['symbol'] if is_dict else pos.symbol
-            vol = pos['volume'] if is_dict else pos.volume
-            prof = pos['profit'] if is_dict else pos.profit
             p_type = pos['type'] if is_dict else pos.type
-            action = "COMPRA 🟢" if p_type == 0 else "VENDA 🔴"
-            msg += f"🔸 <b>{sym}</b> | {action} | {vol} Lotes\n   Lucro Atual: ${prof:.2f}\n\n"
-        await self.send_message(msg)
+            parts.append(line.format_map({
+                'symbol': pos['symbol'] if is_dict else pos.symbol,
+                'action': "COMPRA 🟢" if p_type == 0 else "VENDA 🔴",
+                'volume': pos['volume'] if is_dict else pos.volume,
+                'profit': pos['profit'] if is_dict else pos.profit,
+            }))
+        await self.send_message("".join(parts))
 
     async def _reply_fechar(self, mt5_client: Any, symbol: str) -> None:
         """Fechamento Dinâmico de Nível Sênior - Analisa as regras da corretora na hora."""
         if not await mt5_client.ensure_connected():
-            await self.send_message("⚠️ MT5 Desconectado.")
+            await self.send_message(self.DISCONNECTED_MESSAGE)
             return
 
         positions = await mt5_client.get_positions(symbol)
@@ -203,24 +309,26 @@ class TelegramBot:
             return
             
         await self.send_message(f"🚨 Encerrando TODAS as {len(positions)} posições em aberto...")
-        for pos in positions:
-            sym = pos['symbol'] if isinstance(pos, dict) else pos.symbol
+        # Um fechamento por símbolo (cada um já encerra todas as posições dele),
+        # em sequência: o módulo MetaTrader5 usa uma única conexão IPC e não
+        # é thread-safe, então ordens simultâneas não ganhariam nada
+        symbols = dict.fromkeys(pos['symbol'] if isinstance(pos, dict) else pos.symbol for pos in positions)
+        for sym in symbols:
             await self._reply_fechar(mt5_client, sym)
-            await asyncio.sleep(0.5)
 
     async def send_message(self, message: str) -> bool:
         if not self.enabled: return False
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.base_url}/sendMessage", json={"chat_id": self.chat_id, "text": message, "parse_mode": "HTML"}) as resp:
-                    return resp.status == 200
+            async with self._get_session().post(self._send_url, json={"chat_id": self.chat_id, "text": message, "parse_mode": "HTML"}) as resp:
+                return resp.status == 200
         except Exception as e: return False
 
     async def send_trade_alert(self, symbol, action, price, volume, sl, tp, prob, ticket, balance, equity):
-        if self.alerts_muted: return
+        # Sai antes de montar a mensagem quando não haverá envio
+        if not self.enabled or self.alerts_muted: return
         emoji = "🟢" if action == "BUY" else "🔴"
         msg = f"{emoji} <b>NOVA ORDEM: {symbol}</b>\n{action} | {volume} Lotes\nPreço: {price}\nTicket: <code>{ticket}</code>\n\n🎯 TP: {tp}\n🛑 SL: {sl}\n🤖 IA: {prob:.1%}\n──────────────\n💰 Saldo: ${balance:,.2f}"
-        await self.send_message(msg)
+        self.notify(msg)
 
     async def send_startup_message(self, balance: float):
         if self.enabled:
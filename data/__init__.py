@@ -4,15 +4,20 @@ Módulo data - Engenharia de Features e Filtros Quantitativos.
 Este módulo contém:
 - FeatureEngine: Cálculo de indicadores técnicos
 - CUSUMFilter: Detecção de mudanças estruturais
+- CUSUMBank: CUSUM de vários símbolos em arrays (SoA)
 - BarrierLabeler: Geração de labels para ML
+- RatesBuffer: Buffer pré-alocado de barras OHLCV
 """
 
-from data.features import FeatureEngine, CUSUMFilter, BarrierLabeler
+from data.features import FeatureEngine, CUSUMFilter, CUSUMBank, BarrierLabeler
+from data.buffer import RatesBuffer
 
 __all__ = [
     'FeatureEngine',
     'CUSUMFilter',
+    'CUSUMBank',
     'BarrierLabeler',
+    'RatesBuffer',
 ]
 
 __version__ = '1.0.0'
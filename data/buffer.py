@@ -0,0 +1,163 @@
+"""
+Buffer pré-alocado de barras OHLCV por símbolo.
+
+Este módulo mantém em memória o histórico recente de cada símbolo no
+formato estruturado retornado pelo MetaTrader 5 (copy_rates_from_pos),
+evitando baixar e reconstruir o histórico completo a cada iteração
+do loop de trading. Apenas as barras mais recentes são buscadas e
+incorporadas ao buffer.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RatesBuffer:
+    """
+    Buffer de capacidade fixa com as últimas barras de um símbolo.
+
+    Armazena as colunas do MT5 (time, open, high, low, close,
+    tick_volume, spread, real_volume) em um array estruturado NumPy
+    pré-alocado com o dobro da capacidade. Novas barras são escritas
+    ao final em uma única atribuição de fatia; quando o espaço acaba,
+    as barras da janela são movidas para o início (custo amortizado
+    O(1) por barra), de modo que a janela ativa é sempre uma fatia
+    contígua do array.
+
+    Exemplo:
+        >>> buffer = RatesBuffer(capacity=1000)
+        >>> buffer.reset(mt5.copy_rates_from_pos(symbol, tf, 0, 1000))
+        >>> buffer.update(mt5.copy_rates_from_pos(symbol, tf, 0, 3))
+        >>> df = buffer.to_frame()
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Args:
+            capacity: Número máximo de barras mantidas
+        """
+        self.capacity = capacity
+        self._data: Optional[np.ndarray] = None
+        self._value_fields: Tuple[str, ...] = ()
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_time(self) -> int:
+        """Timestamp (epoch em segundos) da barra mais recente."""
+        return int(self._data['time'][self._end - 1])
+
+    def reset(self, rates: np.ndarray) -> None:
+        """
+        Substitui todo o conteúdo do buffer pelo histórico fornecido.
+
+        Args:
+            rates: Array estruturado retornado por copy_rates_from_pos
+        """
+        rates = rates[-self.capacity:]
+        n = len(rates)
+
+        self._data = np.empty(2 * self.capacity, dtype=rates.dtype)
+        self._value_fields = tuple(name for name in rates.dtype.names if name != 'time')
+        self._data[:n] = rates
+        self._start = 0
+        self._end = n
+
+    def overlaps(self, rates: np.ndarray) -> bool:
+        """
+        Verifica se as barras recentes se encaixam no buffer sem lacunas.
+
+        Args:
+            rates: Barras mais recentes obtidas do MT5
+
+        Returns:
+            True se a primeira barra recebida não é posterior à última
+            barra armazenada (ou seja, nenhuma barra foi perdida)
+        """
+        if len(self) == 0 or len(rates) == 0:
+            return False
+        return int(rates['time'][0]) <= self.last_time
+
+    def update(self, rates: np.ndarray) -> int:
+        """
+        Incorpora as barras mais recentes ao buffer.
+
+        A barra com o mesmo timestamp da última armazenada (barra em
+        formação) é sobrescrita; barras posteriores são anexadas.
+
+        Args:
+            rates: Barras mais recentes, em ordem cronológica
+
+        Returns:
+            Número de novas barras anexadas
+        """
+        times = rates['time']
+        last_time = self._data['time'][self._end - 1]
+
+        # Primeira barra não anterior à última armazenada
+        first = int(np.searchsorted(times, last_time, side='left'))
+
+        if first < len(rates) and times[first] == last_time:
+            # Barra em formação: escrita direta, sem passar pelo pandas
+            self._data[self._end - 1] = rates[first]
+            first += 1
+
+        new_bars = rates[first:]
+        if len(new_bars):
+            self._extend(new_bars)
+
+        return len(new_bars)
+
+    def _extend(self, bars: np.ndarray) -> None:
+        bars = bars[-self.capacity:]
+        n = len(bars)
+
+        if self._end + n > len(self._data):
+            # Compacta: mantém no início do array apenas as barras que
+            # continuarão na janela após a inserção
+            keep = min(len(self), self.capacity - n)
+            self._data[:keep] = self._data[self._end - keep:self._end]
+            self._start = 0
+            self._end = keep
+
+        self._data[self._end:self._end + n] = bars
+        self._end += n
+
+        if self._end - self._start > self.capacity:
+            self._start = self._end - self.capacity
+
+    def view(self) -> np.ndarray:
+        """
+        Retorna a janela ativa do buffer (fatia do array, sem cópia).
+
+        A fatia é somente leitura: consumidores que precisem alterar
+        os dados devem copiá-la explicitamente.
+        """
+        window = self._data[self._start:self._end]
+        window.flags.writeable = False
+        return window
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Constrói um DataFrame indexado por tempo no mesmo formato de
+        MT5Client.get_rates.
+
+        As colunas são copiadas uma única vez direto dos campos do array
+        estruturado, com o índice montado a partir do campo time (sem a
+        cópia extra de set_index).
+        
+        Returns:
+            DataFrame com OHLCV
+        """
+        window = self.view()
+        
+        index = pd.to_datetime(window['time'], unit='s')
+        index.name = 'time'
+        
+        columns = {name: window[name] for name in self._value_fields}
+        return pd.DataFrame(columns, index=index, copy=True)
@@ -4,6 +4,7 @@ Engenharia de Features Quantitativas e Filtros de Mercado.
 Este módulo implementa a fundação quantitativa do sistema de trading:
 1. FeatureEngine: Cálculo vetorizado de indicadores técnicos (EMA, RSI, ATR, ADX, MACD)
 2. CUSUMFilter: Detecção de mudanças estruturais (López de Prado, 2018)
+   CUSUMBank: O mesmo filtro para vários símbolos em arrays (SoA)
 3. BarrierLabeler: Triple-Barrier Method para meta-labeling
 
 Referências Acadêmicas:
@@ -16,10 +17,12 @@ Performance:
 - Memory efficient (dropna agressivo)
 """
 
+import logging
+
 import pandas as pd
 import numpy as np
 import pandas_ta as ta
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Sequence
 from datetime import datetime
 
 from core.logger import get_logger
@@ -47,6 +50,9 @@ class FeatureEngine:
         >>> df = engine.create_ml_features(df)
     """
     
+    # Janelas das features temporais (curto/médio/longo prazo)
+    WINDOWS = (5, 10, 20)
+    
     def __init__(
         self,
         ema_period: int = 200,
@@ -77,13 +83,23 @@ class FeatureEngine:
         self.macd_slow = macd_slow
         self.macd_signal = macd_signal
         
+        # Nomes das colunas geradas pelo pandas_ta (resolvidos uma única vez)
+        macd_suffix = f"{macd_fast}_{macd_slow}_{macd_signal}"
+        self._macd_cols = (f'MACD_{macd_suffix}', f'MACDs_{macd_suffix}', f'MACDh_{macd_suffix}')
+        self._adx_cols = (f'ADX_{adx_period}', f'DMP_{adx_period}', f'DMN_{adx_period}')
+        # (janela, return_mean_N, volatility_N, rsi_mean_N)
+        self._window_cols = tuple(
+            (window, f'return_mean_{window}', f'volatility_{window}', f'rsi_mean_{window}')
+            for window in self.WINDOWS
+        )
+        
         logger.info(
             f"FeatureEngine inicializado - "
             f"EMA: {ema_period}, RSI: {rsi_period}, ATR: {atr_period}, "
             f"ADX: {adx_period}, MACD: {macd_fast}/{macd_slow}/{macd_signal}"
         )
     
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_indicators(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """
         Calcula todos os indicadores técnicos de forma vetorizada.
         
@@ -97,6 +113,8 @@ class FeatureEngine:
         
         Args:
             df: DataFrame com colunas OHLCV (open, high, low, close, tick_volume)
+            copy: Se False, escreve as colunas diretamente em `df` (sem cópia).
+                  Use apenas quando o DataFrame pertence ao chamador.
             
         Returns:
             DataFrame enriquecido com indicadores técnicos
@@ -108,7 +126,8 @@ class FeatureEngine:
             logger.warning("DataFrame vazio recebido em calculate_indicators")
             return pd.DataFrame()
         
-        df = df.copy()
+        if copy:
+            df = df.copy()
         initial_rows = len(df)
         
         try:
@@ -129,9 +148,10 @@ class FeatureEngine:
             )
             
             if macd_result is not None and not macd_result.empty:
-                df['macd'] = macd_result[f'MACD_{self.macd_fast}_{self.macd_slow}_{self.macd_signal}']
-                df['macd_signal'] = macd_result[f'MACDs_{self.macd_fast}_{self.macd_slow}_{self.macd_signal}']
-                df['macd_hist'] = macd_result[f'MACDh_{self.macd_fast}_{self.macd_slow}_{self.macd_signal}']
+                macd_col, signal_col, hist_col = self._macd_cols
+                df['macd'] = macd_result[macd_col]
+                df['macd_signal'] = macd_result[signal_col]
+                df['macd_hist'] = macd_result[hist_col]
                 logger.debug("MACD calculado com sucesso")
             else:
                 df['macd'] = 0.0
@@ -152,9 +172,10 @@ class FeatureEngine:
             )
             
             if adx_result is not None and not adx_result.empty:
-                df['adx'] = adx_result[f'ADX_{self.adx_period}']
-                df['adx_plus'] = adx_result[f'DMP_{self.adx_period}']  # Directional Movement Positive
-                df['adx_minus'] = adx_result[f'DMN_{self.adx_period}']  # Directional Movement Negative
+                adx_col, dmp_col, dmn_col = self._adx_cols
+                df['adx'] = adx_result[adx_col]
+                df['adx_plus'] = adx_result[dmp_col]  # Directional Movement Positive
+                df['adx_minus'] = adx_result[dmn_col]  # Directional Movement Negative
                 logger.debug("ADX calculado com sucesso")
             else:
                 df['adx'] = 0.0
@@ -210,7 +231,7 @@ class FeatureEngine:
             final_rows = len(df)
             dropped = initial_rows - final_rows
             
-            if dropped > 0:
+            if dropped > 0 and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Removidas {dropped} linhas com NaN após cálculo de indicadores")
             
             logger.info(
@@ -224,7 +245,7 @@ class FeatureEngine:
         
         return df
     
-    def create_ml_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def create_ml_features(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """
         Cria features estatísticas avançadas para Meta-Labeling (Machine Learning).
         
@@ -238,6 +259,8 @@ class FeatureEngine:
         
         Args:
             df: DataFrame com indicadores calculados
+            copy: Se False, escreve as colunas diretamente em `df` (sem cópia).
+                  Use apenas quando o DataFrame pertence ao chamador.
             
         Returns:
             DataFrame com features para ML (20+ features)
@@ -249,23 +272,31 @@ class FeatureEngine:
             logger.warning("DataFrame vazio recebido em create_ml_features")
             return pd.DataFrame()
         
-        df = df.copy()
+        if copy:
+            df = df.copy()
         initial_rows = len(df)
         
         try:
             # ========== FEATURES BASEADAS EM JANELAS TEMPORAIS ==========
             
+            # Séries de origem resolvidas uma vez (não a cada janela)
+            returns = df['returns']
+            rsi = df['rsi'] if 'rsi' in df.columns else None
+            
             # Múltiplas janelas para capturar diferentes time scales
-            for window in [5, 10, 20]:
+            for window, return_col, volatility_col, rsi_col in self._window_cols:
+                # Uma única janela móvel para média e desvio dos retornos
+                returns_window = returns.rolling(window)
+                
                 # Média dos retornos (captura momentum de curto/médio/longo prazo)
-                df[f'return_mean_{window}'] = df['returns'].rolling(window).mean()
+                df[return_col] = returns_window.mean()
                 
                 # Volatilidade por janela (detecta mudanças na volatilidade)
-                df[f'volatility_{window}'] = df['returns'].rolling(window).std()
+                df[volatility_col] = returns_window.std()
                 
                 # RSI médio (suaviza oscilações do RSI)
-                if 'rsi' in df.columns:
-                    df[f'rsi_mean_{window}'] = df['rsi'].rolling(window).mean()
+                if rsi is not None:
+                    df[rsi_col] = rsi.rolling(window).mean()
             
             # ========== FEATURES DE TENDÊNCIA ==========
             
@@ -275,7 +306,7 @@ class FeatureEngine:
             # ========== FEATURES DE PRICE ACTION ==========
             
             # Aceleração do preço (segunda derivada)
-            df['price_acceleration'] = df['returns'].diff()
+            df['price_acceleration'] = returns.diff()
             
             # Range normalizado (tamanho da vela / ATR)
             # Valores altos = volatilidade aumentada
@@ -308,7 +339,7 @@ class FeatureEngine:
             final_rows = len(df)
             dropped = initial_rows - final_rows
             
-            if dropped > 0:
+            if dropped > 0 and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Removidas {dropped} linhas com NaN após criação de features ML")
             
             logger.info(
@@ -338,12 +369,8 @@ class FeatureEngine:
         ]
         
         # Features com janelas temporais
-        for window in [5, 10, 20]:
-            base_features.extend([
-                f'return_mean_{window}',
-                f'volatility_{window}',
-                f'rsi_mean_{window}'
-            ])
+        for _, return_col, volatility_col, rsi_col in self._window_cols:
+            base_features.extend([return_col, volatility_col, rsi_col])
         
         # Features de MACD e ADX (se disponíveis)
         base_features.extend([
@@ -419,7 +446,9 @@ class CUSUMFilter:
         
         Args:
             value: Valor observado (tipicamente retorno logarítmico)
-            timestamp: Timestamp da observação (para logging)
+            timestamp: Timestamp da observação (para logging). Inteiros são
+                       interpretados como epoch em segundos e convertidos
+                       apenas quando um evento é detectado
             
         Returns:
             Tupla (evento_detectado: bool, direção: str)
@@ -437,6 +466,7 @@ class CUSUMFilter:
         
         # Detecta evento UP (movimento persistente para cima)
         if self.s_pos > self.threshold:
+            timestamp = self._as_timestamp(timestamp)
             logger.info(
                 f"CUSUM: Evento UP detectado em {timestamp} "
                 f"(S+={self.s_pos:.4f} > {self.threshold:.4f})"
@@ -451,6 +481,7 @@ class CUSUMFilter:
         
         # Detecta evento DOWN (movimento persistente para baixo)
         if self.s_neg < -self.threshold:
+            timestamp = self._as_timestamp(timestamp)
             logger.info(
                 f"CUSUM: Evento DOWN detectado em {timestamp} "
                 f"(S-={self.s_neg:.4f} < {-self.threshold:.4f})"
@@ -466,6 +497,12 @@ class CUSUMFilter:
         # Nenhum evento detectado
         return False, ''
     
+    @staticmethod
+    def _as_timestamp(timestamp: Any) -> Any:
+        if isinstance(timestamp, (int, np.integer)):
+            return pd.Timestamp(int(timestamp), unit='s')
+        return timestamp
+    
     def reset(self) -> None:
         """
         Reseta o estado do filtro CUSUM.
@@ -522,6 +559,149 @@ class CUSUMFilter:
         return stats
 
 
+class CUSUMBank:
+    """
+    Filtros CUSUM de vários símbolos em layout de arrays (SoA).
+    
+    Mesma matemática e semântica de CUSUMFilter, mas o estado de todos os
+    símbolos fica em arrays NumPy indexados por um id inteiro atribuído
+    na criação (ordem da lista de símbolos). Isso evita um objeto por
+    símbolo e permite avaliar todos os símbolos de uma vez.
+    
+    Exemplo:
+        >>> bank = CUSUMBank(['EURUSD', 'GBPUSD'], threshold=0.02, drift=0.001)
+        >>> sids = np.array([bank.symbol_ids['EURUSD']])
+        >>> directions = bank.update_batch(sids, last_returns, timestamps)
+    """
+    
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        threshold: float = 0.02,
+        drift: float = 0.001
+    ):
+        """
+        Args:
+            symbols: Símbolos monitorados (a posição define o id)
+            threshold: Limite para detecção de evento (ver CUSUMFilter)
+            drift: Drift esperado do processo (ver CUSUMFilter)
+        """
+        self.threshold = threshold
+        self.drift = drift
+        
+        self.symbols: Tuple[str, ...] = tuple(symbols)
+        self.symbol_ids: Dict[str, int] = {
+            symbol: sid for sid, symbol in enumerate(self.symbols)
+        }
+        
+        n = len(self.symbols)
+        self.s_pos = np.zeros(n, dtype=np.float64)
+        self.s_neg = np.zeros(n, dtype=np.float64)
+        self.last_event_time: List[Any] = [None] * n
+        # Colunas: eventos UP, eventos DOWN
+        self.event_count = np.zeros((n, 2), dtype=np.int64)
+        
+        logger.info(
+            f"CUSUMBank inicializado - {n} símbolos, "
+            f"Threshold: {threshold:.4f}, Drift: {drift:.6f}"
+        )
+    
+    def update_batch(
+        self,
+        sids: np.ndarray,
+        values: np.ndarray,
+        timestamps: Sequence[Any]
+    ) -> np.ndarray:
+        """
+        Atualiza vários símbolos de uma vez com uma observação cada.
+        
+        Equivale a chamar CUSUMFilter.update uma vez por símbolo, mas o
+        acúmulo e a comparação com o threshold são feitos em uma única
+        passada vetorizada; o trabalho em Python é proporcional apenas
+        ao número de eventos (ver check_cusum.py).
+        
+        Args:
+            sids: Ids dos símbolos (sem repetição)
+            values: Valor observado de cada símbolo (NaN é ignorado)
+            timestamps: Timestamp de cada observação (para logging)
+            
+        Returns:
+            Array int8 com a direção por posição: 1 (UP), -1 (DOWN), 0 (nenhum)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        
+        s_pos = np.maximum(0.0, self.s_pos[sids] + values - self.drift)
+        s_neg = np.minimum(0.0, self.s_neg[sids] + values + self.drift)
+        
+        up = valid & (s_pos > self.threshold)
+        down = valid & ~up & (s_neg < -self.threshold)
+        
+        # Sem evento: persiste o acúmulo (NaN mantém o estado anterior)
+        quiet = valid & ~(up | down)
+        self.s_pos[sids[quiet]] = s_pos[quiet]
+        self.s_neg[sids[quiet]] = s_neg[quiet]
+        
+        directions = np.zeros(len(values), dtype=np.int8)
+        directions[up] = 1
+        directions[down] = -1
+        
+        for i in np.flatnonzero(up):
+            self._fire(int(sids[i]), 'UP', float(s_pos[i]), timestamps[i])
+        for i in np.flatnonzero(down):
+            self._fire(int(sids[i]), 'DOWN', float(s_neg[i]), timestamps[i])
+        
+        return directions
+    
+    def _fire(self, sid: int, direction: str, level: float, timestamp: Any) -> None:
+        timestamp = CUSUMFilter._as_timestamp(timestamp)
+        
+        if direction == 'UP':
+            logger.info(
+                f"CUSUM {self.symbols[sid]}: Evento UP detectado em {timestamp} "
+                f"(S+={level:.4f} > {self.threshold:.4f})"
+            )
+        else:
+            logger.info(
+                f"CUSUM {self.symbols[sid]}: Evento DOWN detectado em {timestamp} "
+                f"(S-={level:.4f} < {-self.threshold:.4f})"
+            )
+        
+        self.s_pos[sid] = 0.0
+        self.s_neg[sid] = 0.0
+        self.last_event_time[sid] = timestamp
+        self.event_count[sid, 0 if direction == 'UP' else 1] += 1
+    
+    def reset(self, sid: Optional[int] = None) -> None:
+        """
+        Reseta o estado de um símbolo (ou de todos, se sid for None).
+        """
+        if sid is None:
+            self.s_pos[:] = 0.0
+            self.s_neg[:] = 0.0
+            self.last_event_time = [None] * len(self.symbols)
+        else:
+            self.s_pos[sid] = 0.0
+            self.s_neg[sid] = 0.0
+            self.last_event_time[sid] = None
+    
+    def get_state(self, symbol: str) -> Dict[str, Any]:
+        """
+        Retorna o estado do filtro de um símbolo no formato de
+        CUSUMFilter.get_state.
+        """
+        sid = self.symbol_ids[symbol]
+        up, down = self.event_count[sid]
+        return {
+            's_pos': float(self.s_pos[sid]),
+            's_neg': float(self.s_neg[sid]),
+            'last_event': self.last_event_time[sid],
+            'event_count': {'UP': int(up), 'DOWN': int(down)},
+            'threshold': self.threshold,
+            'drift': self.drift
+        }
+
+
 class BarrierLabeler:
     """
     Gerador de Labels baseado em Barreiras Triplas (Triple-Barrier Method).
@@ -607,10 +787,16 @@ class BarrierLabeler:
         
         logger.debug(f"Gerando labels para side={side} em {len(df)} barras")
         
+        # Arrays NumPy extraídos uma vez (sem Series.iloc a cada acesso)
+        closes = df['close'].to_numpy()
+        atrs = df['atr'].to_numpy()
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
+        
         # Itera sobre cada barra (exceto últimas max_bars que não têm futuro)
         for i in range(len(df) - self.max_bars):
-            entry_price = df['close'].iloc[i]
-            atr = df['atr'].iloc[i]
+            entry_price = closes[i]
+            atr = atrs[i]
             
             # Pula se ATR inválido
             if pd.isna(atr) or atr <= 0:
@@ -631,8 +817,8 @@ class BarrierLabeler:
                 if i + j >= len(df):
                     break
                 
-                future_high = df['high'].iloc[i + j]
-                future_low = df['low'].iloc[i + j]
+                future_high = highs[i + j]
+                future_low = lows[i + j]
                 
                 # Verifica se atingiu TP (vitória)
                 if side == 1:
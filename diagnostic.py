@@ -13,6 +13,7 @@ Uso:
 """
 
 import asyncio
+import importlib.util
 import json
 import sys
 from pathlib import Path
@@ -22,6 +23,7 @@ from typing import Dict, Any
 sys.path.insert(0, str(Path(__file__).parent))
 
 from core import configure_logging_from_config, get_logger, MT5Client
+from core.config import parse_json_bytes
 
 logger = get_logger(__name__)
 
@@ -56,11 +58,11 @@ class SystemDiagnostic:
         
         all_ok = True
         
+        # find_spec apenas localiza o módulo, sem executar sua inicialização
         for module, package in dependencies.items():
-            try:
-                __import__(module)
+            if importlib.util.find_spec(module) is not None:
                 print(f"✓ {package}")
-            except ImportError:
+            else:
                 print(f"✗ {package} - NÃO INSTALADO")
                 self.issues.append(f"Dependência faltando: {package}")
                 all_ok = False
@@ -85,8 +87,7 @@ class SystemDiagnostic:
         
         # Carrega configuração
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
+            self.config = parse_json_bytes(Path(self.config_path).read_bytes())
             print("✓ JSON válido")
         except json.JSONDecodeError as e:
             print(f"✗ Erro ao parsear JSON: {e}")
@@ -10,7 +10,7 @@ Implementa:
 
 import MetaTrader5 as mt5
 import asyncio
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, Optional, Literal, Iterable, Tuple
 from datetime import datetime
 
 from core.logger import get_logger
@@ -27,6 +27,50 @@ class OrderManager:
     de erros específicos de brokers ECN/STP.
     """
     
+    # Filling mode preferido indexado pelas flags do símbolo
+    # (bit 1 = SYMBOL_FILLING_FOK, bit 2 = SYMBOL_FILLING_IOC, bit 4 = RETURN)
+    _FILLING_BY_FLAGS = tuple(
+        mt5.ORDER_FILLING_FOK if flags & 1 else
+        mt5.ORDER_FILLING_IOC if flags & 2 else
+        mt5.ORDER_FILLING_RETURN
+        for flags in range(8)
+    )
+    
+    # Retcodes definitivos: (mensagem de log, motivo da falha)
+    _TERMINAL_RETCODES = {
+        10006: (  # TRADE_RETCODE_REJECT
+            "✗ ORDEM REJEITADA (10006): {comment}",
+            "Rejeitada pelo broker: {comment}"
+        ),
+        10014: (  # TRADE_RETCODE_INVALID_VOLUME
+            "✗ VOLUME INVÁLIDO (10014): {volume}",
+            "Volume inválido: {volume}"
+        ),
+        10015: (  # TRADE_RETCODE_INVALID_PRICE
+            "✗ PREÇO INVÁLIDO (10015): {price}",
+            "Preço inválido: {price}"
+        ),
+        10016: (  # TRADE_RETCODE_INVALID_STOPS
+            "✗ STOPS INVÁLIDOS (10016) - SL: {sl}, TP: {tp}",
+            "Stops inválidos - SL: {sl}, TP: {tp}"
+        ),
+        10018: (  # TRADE_RETCODE_MARKET_CLOSED
+            "✗ MERCADO FECHADO (10018): {comment}",
+            "Mercado fechado: {comment}"
+        ),
+        10019: (  # TRADE_RETCODE_NO_MONEY
+            "✗ SALDO INSUFICIENTE (10019): {comment}",
+            "Saldo insuficiente: {comment}"
+        ),
+    }
+    
+    # Próximo filling mode a tentar quando o broker rejeita o atual
+    _ALTERNATIVE_FILLING = {
+        mt5.ORDER_FILLING_FOK: mt5.ORDER_FILLING_IOC,
+        mt5.ORDER_FILLING_IOC: mt5.ORDER_FILLING_RETURN,
+        mt5.ORDER_FILLING_RETURN: mt5.ORDER_FILLING_FOK
+    }
+    
     def __init__(
         self,
         mt5_client: MT5Client,
@@ -48,6 +92,15 @@ class OrderManager:
         self.deviation = deviation
         self.max_retries = max_retries
         
+        # Filling mode resolvido por símbolo (metadado estático na sessão)
+        self._filling_cache: Dict[str, int] = {}
+        
+        # Campos constantes das requisições de mercado por símbolo
+        self._request_templates: Dict[str, Dict[str, Any]] = {}
+        
+        # Último SL/TP confirmado por ticket: (sl, tp, ponto do símbolo)
+        self._last_sltp: Dict[int, Tuple[float, float, float]] = {}
+        
         logger.info(
             f"OrderManager inicializado - "
             f"Magic: {magic_number}, Deviation: {deviation}"
@@ -85,49 +138,40 @@ class OrderManager:
         if not await self.mt5_client.ensure_connected():
             return self._order_failed("Sem conexão com MT5")
         
-        # Obtém informações do símbolo
-        symbol_info = await self.mt5_client.get_symbol_info(symbol)
+        # Determina filling mode automaticamente (memorizado por símbolo)
+        filling_mode = await self._get_symbol_filling_mode(symbol)
         
-        if symbol_info is None:
+        if filling_mode is None:
             return self._order_failed(f"Símbolo {symbol} inválido")
         
-        # Determina tipo de ordem MT5
-        if order_type == 'BUY':
-            mt5_order_type = mt5.ORDER_TYPE_BUY
-            price = symbol_info['ask']
-        else:
-            mt5_order_type = mt5.ORDER_TYPE_SELL
-            price = symbol_info['bid']
-        
-        # Determina filling mode automaticamente
-        filling_mode = self._get_filling_mode(symbol_info['filling_mode'])
-        
         logger.info(f"Filling mode detectado: {filling_mode}")
         
+        # Determina tipo de ordem MT5
+        mt5_order_type = mt5.ORDER_TYPE_BUY if order_type == 'BUY' else mt5.ORDER_TYPE_SELL
+        
+        # Monta request a partir do template do símbolo (campos fixos na ordem)
+        request = self._get_request_template(symbol).copy()
+        request.update({
+            "volume": volume,
+            "type": mt5_order_type,
+            "sl": stop_loss,
+            "tp": take_profit,
+            "comment": comment
+        })
+        
         # Tenta enviar ordem com retry em caso de requote
         for attempt in range(1, self.max_retries + 1):
-            # Atualiza preço a cada tentativa
-            symbol_info = await self.mt5_client.get_symbol_info(symbol)
-            if symbol_info is None:
+            # Cotação: a primeira tentativa aceita o tick recente em cache;
+            # retentativas (requote) exigem preço novo
+            tick = await self.mt5_client.get_tick(symbol, max_age=0.1 if attempt == 1 else 0.0)
+            if tick is None:
                 return self._order_failed("Erro ao atualizar cotação")
             
-            price = symbol_info['ask'] if order_type == 'BUY' else symbol_info['bid']
+            price = tick.ask if order_type == 'BUY' else tick.bid
             
-            # Monta request
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": symbol,
-                "volume": volume,
-                "type": mt5_order_type,
-                "price": price,
-                "sl": stop_loss,
-                "tp": take_profit,
-                "deviation": self.deviation,
-                "magic": self.magic_number,
-                "comment": comment,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": filling_mode
-            }
+            # Atualiza campos que variam entre tentativas
+            request["price"] = price
+            request["type_filling"] = filling_mode
             
             logger.info(
                 f"Tentativa {attempt}/{self.max_retries} - "
@@ -138,7 +182,7 @@ class OrderManager:
             result = mt5.order_send(request)
             
             if result is None:
-                error = mt5.last_error()
+                error = self.mt5_client.last_error()
                 logger.error(f"Erro ao enviar ordem: {error}")
                 
                 if attempt < self.max_retries:
@@ -149,6 +193,9 @@ class OrderManager:
             
             # Processa resultado
             if result.retcode == mt5.TRADE_RETCODE_DONE:
+                # Memoriza o filling mode aceito (pode ser o alternativo)
+                self._filling_cache[symbol] = filling_mode
+                
                 logger.info(
                     f"✓ ORDEM EXECUTADA - "
                     f"Ticket: {result.order}, "
@@ -197,30 +244,23 @@ class OrderManager:
                     await asyncio.sleep(0.5)
                     continue
                 else:
+                    self.invalidate(symbol)
                     return self._order_failed(
                         f"Ordem rejeitada (10013): {result.comment}"
                     )
             
-            elif result.retcode == 10006:  # TRADE_RETCODE_REJECT
-                logger.error(f"✗ ORDEM REJEITADA (10006): {result.comment}")
-                return self._order_failed(f"Rejeitada pelo broker: {result.comment}")
-            
-            elif result.retcode == 10014:  # TRADE_RETCODE_INVALID_VOLUME
-                logger.error(f"✗ VOLUME INVÁLIDO (10014): {volume}")
-                return self._order_failed(f"Volume inválido: {volume}")
-            
-            elif result.retcode == 10015:  # TRADE_RETCODE_INVALID_PRICE
-                logger.error(f"✗ PREÇO INVÁLIDO (10015): {price}")
-                return self._order_failed(f"Preço inválido: {price}")
-            
-            elif result.retcode == 10016:  # TRADE_RETCODE_INVALID_STOPS
-                logger.error(
-                    f"✗ STOPS INVÁLIDOS (10016) - "
-                    f"SL: {stop_loss}, TP: {take_profit}"
-                )
-                return self._order_failed(
-                    f"Stops inválidos - SL: {stop_loss}, TP: {take_profit}"
-                )
+            elif result.retcode in self._TERMINAL_RETCODES:
+                # Erros definitivos: não adianta retentar
+                log_template, error_template = self._TERMINAL_RETCODES[result.retcode]
+                details = {
+                    'comment': result.comment,
+                    'volume': volume,
+                    'price': price,
+                    'sl': stop_loss,
+                    'tp': take_profit
+                }
+                logger.error(log_template.format_map(details))
+                return self._order_failed(error_template.format_map(details))
             
             else:
                 logger.error(
@@ -272,35 +312,33 @@ class OrderManager:
             price_type = 'ask'
         
         # Obtém preço atual
-        symbol_info = await self.mt5_client.get_symbol_info(position.symbol)
-        if symbol_info is None:
+        tick = await self.mt5_client.get_tick(position.symbol)
+        filling_mode = await self._get_symbol_filling_mode(position.symbol)
+        if tick is None or filling_mode is None:
             return self._order_failed("Erro ao obter cotação para fechamento")
         
-        price = symbol_info[price_type]
+        price = getattr(tick, price_type)
         
         # Monta request de fechamento
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": position.symbol,
+        request = self._get_request_template(position.symbol).copy()
+        request.update({
             "volume": position.volume,
             "type": order_type,
             "position": ticket,
             "price": price,
-            "deviation": self.deviation,
-            "magic": self.magic_number,
             "comment": comment,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": self._get_filling_mode(symbol_info['filling_mode'])
-        }
+            "type_filling": filling_mode
+        })
         
         # Envia ordem de fechamento
         result = mt5.order_send(request)
         
         if result is None:
-            error = mt5.last_error()
+            error = self.mt5_client.last_error()
             return self._order_failed(f"Erro ao fechar: {error}")
         
         if result.retcode == mt5.TRADE_RETCODE_DONE:
+            self._last_sltp.pop(ticket, None)
             logger.info(f"✓ Posição {ticket} fechada com sucesso")
             
             return {
@@ -315,35 +353,118 @@ class OrderManager:
                 f"Falha ao fechar (retcode {result.retcode}): {result.comment}"
             )
     
-    def _get_filling_mode(self, filling_mode_flags: int) -> int:
+    async def warm_up(self, symbols: Iterable[str]) -> None:
         """
-        Determina filling mode apropriado baseado nas flags do símbolo.
+        Pré-carrega o filling mode dos símbolos operados.
+        
+        Args:
+            symbols: Símbolos a pré-carregar
+        """
+        for symbol in symbols:
+            await self._get_symbol_filling_mode(symbol)
+    
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """
+        Descarta o filling mode memorizado (ex: broker alterou a especificação).
+        
+        Args:
+            symbol: Símbolo a invalidar (None para todos)
+        """
+        if symbol is None:
+            self._filling_cache.clear()
+        else:
+            self._filling_cache.pop(symbol, None)
+    
+    def _get_request_template(self, symbol: str) -> Dict[str, Any]:
+        """
+        Retorna os campos constantes de uma ordem a mercado do símbolo.
+        
+        O template é compartilhado: chamadores devem copiá-lo antes de
+        acrescentar os campos variáveis.
+        
+        Args:
+            symbol: Nome do símbolo
+            
+        Returns:
+            Dicionário com action, symbol, deviation, magic e type_time
+        """
+        template = self._request_templates.get(symbol)
+        
+        if template is None:
+            template = {
+                "action": mt5.TRADE_ACTION_DEAL,
+                "symbol": symbol,
+                "deviation": self.deviation,
+                "magic": self.magic_number,
+                "type_time": mt5.ORDER_TIME_GTC
+            }
+            self._request_templates[symbol] = template
+        
+        return template
+    
+    async def _get_symbol_filling_mode(self, symbol: str) -> Optional[int]:
+        """
+        Retorna o filling mode do símbolo, consultando o MT5 apenas se
+        ainda não estiver memorizado.
+        
+        Args:
+            symbol: Nome do símbolo
+            
+        Returns:
+            Constante MT5 de filling mode ou None se o símbolo for inválido
+        """
+        filling_mode = self._filling_cache.get(symbol)
+        if filling_mode is not None:
+            return filling_mode
+        
+        symbol_info = await self.mt5_client.get_symbol_info(
+            symbol, max_age=self.mt5_client.SYMBOL_STATIC_TTL
+        )
+        if symbol_info is None:
+            return None
+        
+        return self._resolve_filling_mode(symbol, symbol_info['filling_mode'])
+    
+    def _resolve_filling_mode(self, symbol: str, filling_mode_flags: int) -> int:
+        """
+        Retorna o filling mode do símbolo, derivando-o das flags apenas
+        na primeira vez.
         
         Args:
+            symbol: Nome do símbolo
             filling_mode_flags: Flags de filling_mode do símbolo
             
         Returns:
             Constante MT5 de filling mode
         """
-        # Verifica cada modo disponível na ordem de preferência
+        filling_mode = self._filling_cache.get(symbol)
         
-        # FOK (Fill or Kill) - Preferido para execução imediata completa
-        if filling_mode_flags & 1:  # SYMBOL_FILLING_FOK
-            return mt5.ORDER_FILLING_FOK
+        if filling_mode is None:
+            filling_mode = self._get_filling_mode(filling_mode_flags)
+            self._filling_cache[symbol] = filling_mode
         
-        # IOC (Immediate or Cancel) - Permite execução parcial
-        if filling_mode_flags & 2:  # SYMBOL_FILLING_IOC
-            return mt5.ORDER_FILLING_IOC
+        return filling_mode
+    
+    def _get_filling_mode(self, filling_mode_flags: int) -> int:
+        """
+        Determina filling mode apropriado baseado nas flags do símbolo.
         
-        # RETURN - Modo padrão para market orders
-        if filling_mode_flags & 4:  # SYMBOL_FILLING_RETURN
-            return mt5.ORDER_FILLING_RETURN
+        Ordem de preferência: FOK (execução imediata completa), IOC
+        (permite execução parcial) e RETURN (padrão para market orders).
         
-        # Fallback para RETURN (mais comum)
-        logger.warning(
-            f"Filling mode não reconhecido: {filling_mode_flags}. Usando RETURN."
-        )
-        return mt5.ORDER_FILLING_RETURN
+        Args:
+            filling_mode_flags: Flags de filling_mode do símbolo
+            
+        Returns:
+            Constante MT5 de filling mode
+        """
+        if not filling_mode_flags & 7:
+            # Fallback para RETURN (mais comum)
+            logger.warning(
+                f"Filling mode não reconhecido: {filling_mode_flags}. Usando RETURN."
+            )
+        
+        return self._FILLING_BY_FLAGS[filling_mode_flags & 7]
     
     def _get_alternative_filling_mode(self, current_mode: int) -> int:
         """
@@ -355,12 +476,7 @@ class OrderManager:
         Returns:
             Modo alternativo
         """
-        if current_mode == mt5.ORDER_FILLING_FOK:
-            return mt5.ORDER_FILLING_IOC
-        elif current_mode == mt5.ORDER_FILLING_IOC:
-            return mt5.ORDER_FILLING_RETURN
-        else:
-            return mt5.ORDER_FILLING_FOK
+        return self._ALTERNATIVE_FILLING.get(current_mode, mt5.ORDER_FILLING_FOK)
     
     def _order_failed(self, reason: str) -> Dict[str, Any]:
         """
@@ -378,6 +494,23 @@ class OrderManager:
             'timestamp': datetime.now().isoformat()
         }
     
+    def sync_positions(self, open_sltp: Dict[int, Tuple[float, float]]) -> None:
+        """
+        Confere o cache de SL/TP com a visão atual das posições abertas.
+        
+        Descarta tickets que não estão mais abertos (ex: fechados pela
+        corretora no SL/TP) e tickets cujo SL/TP foi alterado fora do
+        robô (ex: no terminal), para que modify_position volte a
+        consultar o MT5 nesses casos.
+        
+        Args:
+            open_sltp: (sl, tp) por ticket, lido uma vez por iteração
+        """
+        for ticket, (sl, tp, point) in list(self._last_sltp.items()):
+            current = open_sltp.get(ticket)
+            if current is None or abs(current[0] - sl) >= point or abs(current[1] - tp) >= point:
+                del self._last_sltp[ticket]
+    
     async def modify_position(
         self,
         ticket: int,
@@ -394,10 +527,27 @@ class OrderManager:
             
         Returns:
             Dicionário com resultado
+            
+        Note:
+            Alterações menores que um ponto do símbolo em relação ao
+            último SL/TP enviado são ignoradas sem chamar o MT5. O cache
+            só vale para tickets confirmados abertos, com o mesmo SL/TP,
+            na última chamada a sync_positions.
         """
+        cached = self._last_sltp.get(ticket)
+        
+        if cached is not None:
+            prev_sl, prev_tp, point = cached
+            sl = new_sl if new_sl is not None else prev_sl
+            tp = new_tp if new_tp is not None else prev_tp
+            
+            if abs(sl - prev_sl) < point and abs(tp - prev_tp) < point:
+                return {'success': True, 'ticket': ticket, 'sl': prev_sl, 'tp': prev_tp, 'unchanged': True}
+        
         position = mt5.positions_get(ticket=ticket)
         
         if position is None or len(position) == 0:
+            self._last_sltp.pop(ticket, None)
             return self._order_failed(f"Posição {ticket} não encontrada")
         
         position = position[0]
@@ -406,6 +556,19 @@ class OrderManager:
         sl = new_sl if new_sl is not None else position.sl
         tp = new_tp if new_tp is not None else position.tp
         
+        # Tamanho do ponto do símbolo (resolvido uma vez por ticket)
+        if cached is not None:
+            point = cached[2]
+        else:
+            symbol_info = await self.mt5_client.get_symbol_info(
+                position.symbol, max_age=self.mt5_client.SYMBOL_STATIC_TTL
+            )
+            point = symbol_info['point'] if symbol_info else 0.0
+        
+        if abs(sl - position.sl) < point and abs(tp - position.tp) < point:
+            self._last_sltp[ticket] = (position.sl, position.tp, point)
+            return {'success': True, 'ticket': ticket, 'sl': position.sl, 'tp': position.tp, 'unchanged': True}
+        
         request = {
             "action": mt5.TRADE_ACTION_SLTP,
             "symbol": position.symbol,
@@ -417,10 +580,14 @@ class OrderManager:
         result = mt5.order_send(request)
         
         if result is None:
-            error = mt5.last_error()
+            error = self.mt5_client.last_error()
             return self._order_failed(f"Erro ao modificar: {error}")
         
         if result.retcode == mt5.TRADE_RETCODE_DONE:
+            # Sem o ponto do símbolo (falha transitória na consulta) não há
+            # cache: a próxima chamada consulta o símbolo novamente
+            if point > 0:
+                self._last_sltp[ticket] = (sl, tp, point)
             logger.info(f"✓ Posição {ticket} modificada - SL: {sl}, TP: {tp}")
             return {'success': True, 'ticket': ticket, 'sl': sl, 'tp': tp}
         else:
@@ -31,16 +31,20 @@ warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
 # -----------------------------------------------------------
 
 import asyncio
-import json
+import gc
+import logging
 import signal
 import sys
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # Imports dos módulos do sistema
-from core import configure_logging_from_config, get_logger, MT5Client, measure_time, TelegramBot
-from data import FeatureEngine, CUSUMFilter
+from core import configure_logging_from_config, get_logger, load_config, MT5Client, measure_time, TelegramBot
+from data import FeatureEngine, CUSUMBank, RatesBuffer
 from strategies import PrimaryStrategy, MetaLabeler, AITradingLogic
 from risk import KellyRiskManager
 from execution import OrderManager
@@ -57,6 +61,19 @@ class TradingBot:
     com tratamento robusto de erros e reconexão automática.
     """
     
+    # Barras buscadas a cada iteração para atualizar o buffer de preços
+    UPDATE_BARS = 3
+    
+    # Validade (segundos) do snapshot de saldo/equity da conta
+    ACCOUNT_TTL = 15.0
+    
+    # Intervalo entre verificações de retreinamento (nanossegundos monotônicos)
+    RETRAIN_CHECK_INTERVAL_NS = 60 * 1_000_000_000
+    
+    # Espera após erro no loop (segundos): dobra a cada falha consecutiva
+    ERROR_BACKOFF_BASE = 5.0
+    ERROR_BACKOFF_MAX = 300.0
+    
     def __init__(self, config_path: str = "config/settings.json"):
         """
         Inicializa o robô de trading.
@@ -68,13 +85,30 @@ class TradingBot:
         self.config: Dict[str, Any] = {}
         self.running = False
         
+        # Sinalizado no shutdown para interromper as esperas do loop na hora
+        self._stop_event = asyncio.Event()
+        
+        # shutdown() pode ser chamado pelo handler de sinal e pelo finally de
+        # run(): apenas a primeira chamada executa, as demais aguardam o fim
+        self._shutting_down = False
+        self._shutdown_done = asyncio.Event()
+        
+        # Serializa a execução de ordens entre símbolos processados em paralelo
+        self._order_lock = asyncio.Lock()
+        
         # Tarefa de Background do Telegram
         self.telegram_task: Optional[asyncio.Task] = None
         
         # Componentes do sistema (inicializados em setup)
         self.mt5_client: Optional[MT5Client] = None
         self.feature_engine: Optional[FeatureEngine] = None
-        self.cusum_filters: Dict[str, CUSUMFilter] = {}
+        self.cusum: Optional[CUSUMBank] = None
+        self._event_sids: np.ndarray = np.empty(0, dtype=np.intp)
+        self._tail_closes: np.ndarray = np.empty((2, 0), dtype=np.float64)
+        self.rate_buffers: Dict[str, RatesBuffer] = {}
+        
+        # Última análise por símbolo: (bytes da última barra, sinal)
+        self._analysis_memo: Dict[str, Tuple[bytes, Dict[str, Any]]] = {}
         self.primary_strategy: Optional[PrimaryStrategy] = None
         self.meta_labeler: Optional[MetaLabeler] = None
         self.ai_logic: Optional[AITradingLogic] = None
@@ -83,9 +117,20 @@ class TradingBot:
         self.telegram: Optional[TelegramBot] = None
         
         # Estado do sistema
-        self.symbols: list = []
+        self.symbols: Tuple[str, ...] = ()
+        
+        # Parâmetros lidos a cada iteração (resolvidos uma vez em setup)
+        self.timeframe: str = ""
+        self.lookback_bars: int = 0
+        self.min_data_points: int = 0
+        self.max_positions: int = 0
+        self.retrain_interval: timedelta = timedelta(hours=168)
         self.active_positions: Dict[str, Any] = {}
-        self.last_retrain_check = datetime.now()
+        self._account_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+        # Total de posições abertas: contado no início da iteração e
+        # incrementado a cada ordem executada (sob _order_lock)
+        self._open_positions_total: int = 0
+        self._last_retrain_check_ns = time.monotonic_ns()
         
         logger.info("=" * 80)
         logger.info("TradingBot Inicializado")
@@ -96,8 +141,7 @@ class TradingBot:
         Carrega configurações do arquivo JSON.
         """
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            self.config = load_config(self.config_path)
             
             logger.info(f"Configurações carregadas de {self.config_path}")
             
@@ -151,13 +195,18 @@ class TradingBot:
             atr_period=strategy_config['atr_period']
         )
         
-        # Inicializa filtros CUSUM para cada símbolo
-        self.symbols = self.config['trading']['symbols']
-        for symbol in self.symbols:
-            self.cusum_filters[symbol] = CUSUMFilter(
-                threshold=strategy_config['cusum_threshold'],
-                drift=strategy_config['cusum_drift']
-            )
+        # Inicializa filtros CUSUM de todos os símbolos (id = posição na tupla)
+        # Símbolos internados: todas as chaves de dicionário por símbolo
+        # (buffers, memo, caches do MT5Client) compartilham a mesma instância
+        self.symbols = tuple(sys.intern(symbol) for symbol in self.config['trading']['symbols'])
+        self.cusum = CUSUMBank(
+            self.symbols,
+            threshold=strategy_config['cusum_threshold'],
+            drift=strategy_config['cusum_drift']
+        )
+        # Áreas de trabalho de detect_events (reaproveitadas a cada iteração)
+        self._event_sids = np.empty(len(self.symbols), dtype=np.intp)
+        self._tail_closes = np.empty((2, len(self.symbols)), dtype=np.float64)
         
         # Inicializa Estratégia Primária
         risk_config = self.config['risk']
@@ -199,12 +248,33 @@ class TradingBot:
         
         # Inicializa Order Manager
         trading_config = self.config['trading']
+        
+        # Resolve uma única vez os parâmetros consultados no loop quente
+        self.timeframe = trading_config['timeframe']
+        self.max_positions = trading_config['max_positions']
+        self.lookback_bars = strategy_config['lookback_bars']
+        self.min_data_points = strategy_config['min_data_points']
+        # Intervalo de retreinamento (padrão 168h = 1 semana)
+        self.retrain_interval = timedelta(
+            hours=self.config['ml'].get('retrain_interval_hours', 168)
+        )
+        
+        # Buffers de preços por símbolo (preenchidos na primeira iteração)
+        for symbol in self.symbols:
+            self.rate_buffers[symbol] = RatesBuffer(capacity=self.lookback_bars)
+        
         self.order_manager = OrderManager(
             mt5_client=self.mt5_client,
             magic_number=trading_config['magic_number'],
             deviation=trading_config['deviation'],
             max_retries=3
         )
+        await self.order_manager.warm_up(self.symbols)
+        
+        # Carga inicial do histórico de todos os símbolos em um único lote
+        backfilled = await self.refresh_rates()
+        loaded = sum(1 for buffer in backfilled.values() if buffer is not None)
+        logger.info(f"Histórico carregado para {loaded}/{len(self.symbols)} símbolos")
         
         logger.info("✓ Todos os componentes inicializados com sucesso")
     
@@ -214,19 +284,13 @@ class TradingBot:
         Se necessário, pausa o trading, treina e recarrega o modelo.
         """
         try:
-            # Intervalo configurado (padrão 168h = 1 semana)
-            interval_hours = self.config['ml'].get('retrain_interval_hours', 168)
             last_train = self.meta_labeler.last_training_date
             
-            should_train = False
-            
-            # Se nunca foi treinado ou se passou do tempo
-            if last_train is None:
-                should_train = True
-            else:
-                elapsed = datetime.now() - last_train
-                if elapsed.total_seconds() > (interval_hours * 3600):
-                    should_train = True
+            # Se nunca foi treinado ou se passou do tempo (intervalo resolvido no setup)
+            should_train = (
+                last_train is None
+                or datetime.now() - last_train > self.retrain_interval
+            )
             
             if should_train:
                 logger.info("⏳ Modelo desatualizado. Iniciando retreinamento automático...")
@@ -247,6 +311,8 @@ class TradingBot:
                 if result['success']:
                     # Recarrega o modelo novo na memória
                     self.meta_labeler.reload()
+                    # Sinais memorizados foram aprovados/rejeitados pelo modelo antigo
+                    self._analysis_memo.clear()
                     logger.info(f"✓ Modelo atualizado com sucesso. Nova acurácia: {result['acc']:.2%}")
                     
                     if self.telegram:
@@ -263,52 +329,183 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Erro no processo de retreinamento: {e}", exc_info=True)
 
-    @measure_time
-    async def process_symbol(self, symbol: str) -> None:
+    async def get_account_snapshot(self) -> Optional[Dict[str, Any]]:
         """
-        Processa um símbolo: análise, geração de sinal e execução.
+        Obtém informações da conta, reaproveitando a última leitura
+        por até ACCOUNT_TTL segundos.
         
-        Args:
-            symbol: Nome do símbolo a processar
+        Returns:
+            Dicionário com informações da conta ou None em caso de erro
         """
-        try:
-            # Verifica se já existe posição aberta para este símbolo
-            existing_positions = await self.mt5_client.get_positions(symbol)
-            
-            if existing_positions:
-                logger.debug(f"{symbol}: Posição já aberta, pulando análise")
-                return
+        now = time.monotonic()
+        fetched_at, account_info = self._account_cache
+        
+        if account_info is not None and now - fetched_at < self.ACCOUNT_TTL:
+            return account_info
+        
+        account_info = await self.mt5_client.get_account_info()
+        if account_info is not None:
+            self._account_cache = (now, account_info)
+        
+        return account_info
+    
+    def invalidate_account_snapshot(self) -> None:
+        """
+        Descarta o snapshot da conta (ex: após execução de ordem).
+        """
+        self._account_cache = (0.0, None)
+    
+    async def refresh_rates(self) -> Dict[str, Optional[RatesBuffer]]:
+        """
+        Atualiza os buffers de preços de todos os símbolos.
+        
+        As buscas de todos os símbolos são feitas em lote (uma passada
+        sequencial pelo MT5Client). Símbolos com buffer vazio recebem o histórico
+        completo; os demais, apenas as últimas UPDATE_BARS barras. Se
+        houver lacuna desde a última barra armazenada, o histórico
+        completo do símbolo é recarregado em um segundo lote.
+        
+        Returns:
+            Dicionário símbolo -> buffer atualizado (None em caso de erro)
+        """
+        counts = {
+            symbol: self.UPDATE_BARS if len(buffer) > 0 else self.lookback_bars
+            for symbol, buffer in self.rate_buffers.items()
+        }
+        
+        results = await self.mt5_client.get_rates_batch(counts, self.timeframe)
+        
+        refreshed: Dict[str, Optional[RatesBuffer]] = {}
+        reload: Dict[str, int] = {}
+        
+        for symbol, rates in results.items():
+            buffer = self.rate_buffers[symbol]
+            
+            if rates is None:
+                refreshed[symbol] = None
+            elif len(buffer) == 0:
+                buffer.reset(rates)
+                refreshed[symbol] = buffer
+            elif buffer.overlaps(rates):
+                buffer.update(rates)
+                refreshed[symbol] = buffer
+            else:
+                logger.info(f"{symbol}: Lacuna no histórico, recarregando buffer completo")
+                reload[symbol] = self.lookback_bars
+        
+        if reload:
+            results = await self.mt5_client.get_rates_batch(reload, self.timeframe)
             
-            # Obtém dados históricos
-            timeframe = self.config['trading']['timeframe']
-            lookback = self.config['strategy']['lookback_bars']
+            for symbol, rates in results.items():
+                if rates is None:
+                    refreshed[symbol] = None
+                else:
+                    self.rate_buffers[symbol].reset(rates)
+                    refreshed[symbol] = self.rate_buffers[symbol]
+        
+        return refreshed
+    
+    def detect_events(
+        self,
+        buffers: Dict[str, Optional[RatesBuffer]],
+        position_counts: Dict[str, int]
+    ) -> List[Tuple[str, RatesBuffer, str]]:
+        """
+        Atualiza o CUSUM de todos os símbolos elegíveis em uma única
+        passada vetorizada e retorna apenas os que dispararam evento.
+        
+        Símbolos com posição aberta ou sem dados suficientes não
+        atualizam o filtro (mesmo comportamento de antes).
+        
+        Args:
+            buffers: Buffers de preços já atualizados (None se a busca falhou)
+            position_counts: Posições abertas por símbolo (uma consulta por iteração)
             
-            df = await self.mt5_client.get_rates(symbol, timeframe, lookback)
+        Returns:
+            Lista de (símbolo, buffer, direção) com evento CUSUM
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # Matriz (2, N) com os dois últimos fechamentos de cada símbolo elegível
+        sids = self._event_sids
+        tail_closes = self._tail_closes
+        timestamps = []
+        n = 0
+        
+        for sid, symbol in enumerate(self.symbols):
+            # Verifica se já existe posição aberta para este símbolo
+            if position_counts.get(symbol, 0):
+                if debug:
+                    logger.debug(f"{symbol}: Posição já aberta, pulando análise")
+                continue
             
-            if df is None or len(df) < self.config['strategy']['min_data_points']:
+            buffer = buffers.get(symbol)
+            if buffer is None or len(buffer) < self.min_data_points:
                 logger.warning(f"{symbol}: Dados insuficientes")
-                return
-            
-            # Calcula retorno logarítmico para CUSUM
-            df['log_return'] = df['close'].pct_change().apply(lambda x: 0 if abs(x) < 1e-10 else x)
-            last_return = df['log_return'].iloc[-1]
+                continue
             
-            # Atualiza filtro CUSUM
-            cusum_filter = self.cusum_filters[symbol]
-            event_detected, direction = cusum_filter.update(
-                last_return,
-                df.index[-1]
-            )
+            rates = buffer.view()
+            sids[n] = sid
+            tail_closes[:, n] = rates['close'][-2:]
+            timestamps.append(rates['time'][-1])
+            n += 1
+        
+        if n == 0:
+            return []
+        
+        # Retorno da última barra de todos os símbolos em uma única operação
+        prev_close = tail_closes[0, :n]
+        returns = (tail_closes[1, :n] - prev_close) / prev_close
+        returns[np.abs(returns) < 1e-10] = 0.0
+        
+        directions = self.cusum.update_batch(sids[:n], returns, timestamps)
+        
+        if debug:
+            for i in np.flatnonzero(directions == 0):
+                logger.debug(f"{self.symbols[sids[i]]}: Nenhum evento CUSUM detectado")
+        
+        events = []
+        for i in np.flatnonzero(directions):
+            symbol = self.symbols[sids[i]]
+            events.append((symbol, buffers[symbol], 'UP' if directions[i] > 0 else 'DOWN'))
+        
+        return events
+    
+    @measure_time
+    async def process_symbol(
+        self,
+        symbol: str,
+        buffer: RatesBuffer,
+        direction: str
+    ) -> None:
+        """
+        Processa um símbolo com evento CUSUM: análise, geração de sinal e execução.
+        
+        Args:
+            symbol: Nome do símbolo a processar
+            buffer: Buffer de preços já atualizado
+            direction: Direção do evento CUSUM ('UP' ou 'DOWN')
+        """
+        try:
+            logger.info(f"{symbol}: ⚡ EVENTO CUSUM DETECTADO - Direção: {direction}")
             
-            # Só prossegue se CUSUM detectou evento
-            if not event_detected:
-                logger.debug(f"{symbol}: Nenhum evento CUSUM detectado")
-                return
+            rates = buffer.view()
             
-            logger.info(f"{symbol}: ⚡ EVENTO CUSUM DETECTADO - Direção: {direction}")
+            # Barras fechadas não mudam: se a última barra (em formação) é a
+            # mesma da análise anterior, o resultado também é o mesmo
+            bar_key = rates[-1].tobytes()
+            memo = self._analysis_memo.get(symbol)
             
-            # Analisa com IA
-            signal = self.ai_logic.analyze(df)
+            if memo is not None and memo[0] == bar_key:
+                signal = memo[1]
+            else:
+                # Indicadores só são calculados quando há evento CUSUM
+                df = buffer.to_frame()
+                
+                # Analisa com IA (CPU) fora do event loop, liberando os demais símbolos
+                loop = asyncio.get_running_loop()
+                signal = await loop.run_in_executor(None, self.ai_logic.analyze, df)
+                self._analysis_memo[symbol] = (bar_key, signal)
             
             if signal['action'] == 'HOLD':
                 logger.info(f"{symbol}: Nenhum sinal de trading gerado")
@@ -327,115 +524,120 @@ class TradingBot:
                 f"Probabilidade: {signal['meta_probability']:.2%}"
             )
             
-            # Obtém informações da conta
-            account_info = await self.mt5_client.get_account_info()
-            if account_info is None:
-                logger.error(f"{symbol}: Erro ao obter informações da conta")
-                return
-            
-            # Obtém informações do símbolo
-            symbol_info = await self.mt5_client.get_symbol_info(symbol)
-            if symbol_info is None:
-                logger.error(f"{symbol}: Erro ao obter informações do símbolo")
-                return
-            
-            # Calcula payoff ratio
-            payoff_ratio = self.risk_manager.calculate_payoff_ratio(
-                entry_price=signal['entry_price'],
-                stop_loss=signal['sl'],
-                take_profit=signal['tp']
-            )
-            
-            # Calcula tamanho da posição
-            position_size = self.risk_manager.calculate_position_size(
-                account_balance=account_info['balance'],
-                entry_price=signal['entry_price'],
-                stop_loss=signal['sl'],
-                symbol_info=symbol_info,
-                win_rate=signal['meta_probability'],
-                payoff_ratio=payoff_ratio
-            )
-            
-            if not position_size['valid']:
-                logger.error(f"{symbol}: Tamanho de posição inválido")
-                return
-            
-            # Valida trade
-            all_positions = await self.mt5_client.get_positions()
-            max_positions = self.config['trading']['max_positions']
-            
-            validation = self.risk_manager.validate_trade(
-                account_balance=account_info['balance'],
-                account_equity=account_info['equity'],
-                existing_positions=len(all_positions),
-                max_positions=max_positions,
-                proposed_risk=position_size['risk_amount']
-            )
-            
-            if not validation['approved']:
-                logger.warning(f"{symbol}: Trade rejeitado pela validação de risco")
-                return
-            
-            # Executa ordem
-            logger.info(
-                f"{symbol}: Executando {signal['action']} - "
-                f"{position_size['volume']:.2f} lots"
-            )
-            
-            order_result = await self.order_manager.send_market_order(
-                symbol=symbol,
-                order_type=signal['action'],
-                volume=position_size['volume'],
-                stop_loss=signal['sl'],
-                take_profit=signal['tp'],
-                comment=f"AI-{signal['meta_probability']:.0%}"
-            )
-            
-            if order_result['success']:
-                logger.info(
-                    f"{symbol}: ✓✓✓ ORDEM EXECUTADA COM SUCESSO ✓✓✓"
+            # Dimensionamento, validação de risco e envio são serializados entre
+            # símbolos: a contagem de posições e o saldo devem refletir a ordem anterior
+            async with self._order_lock:
+                # Obtém informações da conta (snapshot recente)
+                account_info = await self.get_account_snapshot()
+                if account_info is None:
+                    logger.error(f"{symbol}: Erro ao obter informações da conta")
+                    return
+                
+                # Obtém informações do símbolo
+                symbol_info = await self.mt5_client.get_symbol_info(symbol)
+                if symbol_info is None:
+                    logger.error(f"{symbol}: Erro ao obter informações do símbolo")
+                    return
+                
+                # Calcula payoff ratio
+                payoff_ratio = self.risk_manager.calculate_payoff_ratio(
+                    entry_price=signal['entry_price'],
+                    stop_loss=signal['sl'],
+                    take_profit=signal['tp']
+                )
+                
+                # Calcula tamanho da posição
+                position_size = self.risk_manager.calculate_position_size(
+                    account_balance=account_info['balance'],
+                    entry_price=signal['entry_price'],
+                    stop_loss=signal['sl'],
+                    symbol_info=symbol_info,
+                    win_rate=signal['meta_probability'],
+                    payoff_ratio=payoff_ratio
+                )
+                
+                if not position_size['valid']:
+                    logger.error(f"{symbol}: Tamanho de posição inválido")
+                    return
+                
+                # Valida trade (contagem local: dispensa nova consulta de posições)
+                validation = self.risk_manager.validate_trade(
+                    account_balance=account_info['balance'],
+                    account_equity=account_info['equity'],
+                    existing_positions=self._open_positions_total,
+                    max_positions=self.max_positions,
+                    proposed_risk=position_size['risk_amount']
                 )
+                
+                if not validation['approved']:
+                    logger.warning(f"{symbol}: Trade rejeitado pela validação de risco")
+                    return
+                
+                # Executa ordem
                 logger.info(
-                    f"Ticket: {order_result['ticket']}, "
-                    f"Preço: {order_result['price']}, "
-                    f"Risco: {position_size['risk_amount']:.2f} "
-                    f"({position_size['risk_percentage']:.2f}%)"
+                    f"{symbol}: Executando {signal['action']} - "
+                    f"{position_size['volume']:.2f} lots"
                 )
                 
-                # Armazena informação da posição
-                self.active_positions[symbol] = {
-                    'ticket': order_result['ticket'],
-                    'opened_at': datetime.now(),
-                    'signal': signal,
-                    'position_size': position_size
-                }
+                order_result = await self.order_manager.send_market_order(
+                    symbol=symbol,
+                    order_type=signal['action'],
+                    volume=position_size['volume'],
+                    stop_loss=signal['sl'],
+                    take_profit=signal['tp'],
+                    comment=f"AI-{signal['meta_probability']:.0%}"
+                )
                 
-                # --- NOTIFICAÇÃO TELEGRAM ---
-                if self.telegram:
-                    # Obtém dados atualizados da conta para mostrar o saldo correto
-                    updated_account = await self.mt5_client.get_account_info()
-                    balance = updated_account['balance'] if updated_account else account_info['balance']
-                    equity = updated_account['equity'] if updated_account else account_info['equity']
-
-                    await self.telegram.send_trade_alert(
-                        symbol=symbol,
-                        action=signal['action'],
-                        price=order_result['price'],
-                        volume=position_size['volume'],
-                        sl=signal['sl'],
-                        tp=signal['tp'],
-                        prob=signal['meta_probability'],
-                        ticket=order_result['ticket'],
-                        balance=balance,
-                        equity=equity
+                if order_result['success']:
+                    logger.info(
+                        f"{symbol}: ✓✓✓ ORDEM EXECUTADA COM SUCESSO ✓✓✓"
                     )
-                # -----------------------------
+                    logger.info(
+                        f"Ticket: {order_result['ticket']}, "
+                        f"Preço: {order_result['price']}, "
+                        f"Risco: {position_size['risk_amount']:.2f} "
+                        f"({position_size['risk_percentage']:.2f}%)"
+                    )
+                    
+                    # Saldo/margem mudaram: a próxima leitura deve ser nova
+                    self.invalidate_account_snapshot()
+                    self._open_positions_total += 1
+                    
+                    # Armazena informação da posição
+                    self.active_positions[symbol] = {
+                        'ticket': order_result['ticket'],
+                        'opened_at': datetime.now(),
+                        'signal': signal,
+                        'position_size': position_size
+                    }
+                    
+                    # --- NOTIFICAÇÃO TELEGRAM ---
+                    # (sem consulta extra à conta quando o alerta não seria enviado)
+                    if self.telegram and self.telegram.enabled and not self.telegram.alerts_muted:
+                        # Obtém dados atualizados da conta para mostrar o saldo correto
+                        updated_account = await self.get_account_snapshot()
+                        balance = updated_account['balance'] if updated_account else account_info['balance']
+                        equity = updated_account['equity'] if updated_account else account_info['equity']
 
-            else:
-                logger.error(
-                    f"{symbol}: ✗ FALHA NA EXECUÇÃO: {order_result.get('error')}"
-                )
-        
+                        await self.telegram.send_trade_alert(
+                            symbol=symbol,
+                            action=signal['action'],
+                            price=order_result['price'],
+                            volume=position_size['volume'],
+                            sl=signal['sl'],
+                            tp=signal['tp'],
+                            prob=signal['meta_probability'],
+                            ticket=order_result['ticket'],
+                            balance=balance,
+                            equity=equity
+                        )
+                    # -----------------------------
+
+                else:
+                    logger.error(
+                        f"{symbol}: ✗ FALHA NA EXECUÇÃO: {order_result.get('error')}"
+                    )
+            
         except Exception as e:
             logger.error(f"{symbol}: Erro no processamento de {symbol}: {e}", exc_info=True)
     
@@ -455,6 +657,11 @@ class TradingBot:
         logger.info("=" * 80)
         
         iteration = 0
+        error_delay = self.ERROR_BACKOFF_BASE
+        
+        # Cadência por prazo (relógio monotônico): o tempo gasto na iteração
+        # é descontado da espera, sem acumular deriva
+        deadline = time.monotonic()
         
         while self.running:
             try:
@@ -462,60 +669,116 @@ class TradingBot:
                 if iteration % 100 == 0:
                     logger.info(f"--- Iteração {iteration} ---")
                 
-                # Garante conexão
-                if not await self.mt5_client.ensure_connected():
-                    logger.error("Conexão perdida. Tentando reconectar...")
-                    await asyncio.sleep(5.0)
-                    continue
-                
                 # VERIFICAÇÃO DE RETREINAMENTO AUTOMÁTICO
                 # Verifica a cada ~60 segundos para não sobrecarregar
-                if (datetime.now() - self.last_retrain_check).total_seconds() > 60:
+                # (relógio monotônico: imune a ajustes de NTP/horário de verão)
+                if time.monotonic_ns() - self._last_retrain_check_ns > self.RETRAIN_CHECK_INTERVAL_NS:
                     await self.check_and_retrain_model()
-                    self.last_retrain_check = datetime.now()
+                    # Novo horário: o retreinamento pode ter levado minutos
+                    self._last_retrain_check_ns = time.monotonic_ns()
+                
+                # Atualiza dados de todos os símbolos em lote
+                buffers = await self.refresh_rates()
                 
-                # Processa cada símbolo
-                for symbol in self.symbols:
-                    await self.process_symbol(symbol)
+                # Uma única consulta de posições: contagem por símbolo e SL/TP
+                # por ticket (valida o cache de SL/TP do OrderManager)
+                position_counts, open_sltp = await self.mt5_client.get_positions_snapshot()
+                self._open_positions_total = sum(position_counts.values())
+                self.order_manager.sync_positions(open_sltp)
                 
-                # Aguarda antes da próxima iteração (NON-BLOCKING)
-                await asyncio.sleep(loop_interval)
+                # CUSUM de todos os símbolos em lote; só os eventos seguem adiante
+                events = self.detect_events(buffers, position_counts)
+                
+                # Processa os símbolos com evento concorrentemente
+                if events:
+                    await asyncio.gather(*(
+                        self.process_symbol(symbol, buffer, direction)
+                        for symbol, buffer, direction in events
+                    ))
+                
+                # Iteração completa: a próxima falha volta a esperar o mínimo
+                error_delay = self.ERROR_BACKOFF_BASE
+                
+                # Aguarda até o próximo prazo (NON-BLOCKING, interrompível)
+                deadline += loop_interval
+                sleep_for = deadline - time.monotonic()
+                if sleep_for > 0:
+                    await self._wait(sleep_for)
+                else:
+                    # Atrasado: segue direto e reancora o prazo, sem tentar
+                    # compensar as iterações perdidas
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Loop atrasado em {-sleep_for:.1f}s")
+                    deadline = time.monotonic()
             
             except KeyboardInterrupt:
                 logger.info("Interrupção do usuário detectada")
                 break
             
             except Exception as e:
-                logger.error(f"Erro no loop de trading: {e}", exc_info=True)
-                await asyncio.sleep(5.0)  # Delay em caso de erro
+                logger.error(
+                    f"Erro no loop de trading: {e}. Nova tentativa em {error_delay:.0f}s",
+                    exc_info=True
+                )
+                # Backoff exponencial: falhas persistentes (ex: terminal fora do ar)
+                # não geram uma enxurrada de chamadas e logs a cada 5s
+                await self._wait(error_delay)
+                error_delay = min(error_delay * 2, self.ERROR_BACKOFF_MAX)
+                deadline = time.monotonic()
         
         logger.info("Loop de trading finalizado")
     
+    async def _wait(self, seconds: float) -> None:
+        """
+        Aguarda o intervalo informado ou até o shutdown ser solicitado.
+        
+        Args:
+            seconds: Tempo máximo de espera
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    
     async def shutdown(self) -> None:
         """
         Desliga o sistema de forma segura.
         """
-        logger.info("Iniciando shutdown...")
+        if self._shutting_down:
+            await self._shutdown_done.wait()
+            return
+        self._shutting_down = True
         
-        self.running = False
-        
-        # Para o bot do Telegram
-        if self.telegram:
-            self.telegram.stop()
+        logger.info("Iniciando shutdown...")
             
-        if self.telegram_task:
-            logger.info("Cancelando tarefa do Telegram...")
-            self.telegram_task.cancel()
-            try:
-                await self.telegram_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Desconecta do MT5
-        if self.mt5_client:
-            await self.mt5_client.disconnect()
-        
-        logger.info("Shutdown concluído")
+        try:
+            self.running = False
+            self._stop_event.set()
+            
+            # Para o bot do Telegram (entregando alertas ainda na fila)
+            if self.telegram:
+                self.telegram.stop()
+                await self.telegram.flush(timeout=5.0)
+            
+            if self.telegram_task:
+                logger.info("Cancelando tarefa do Telegram...")
+                self.telegram_task.cancel()
+                try:
+                    await self.telegram_task
+                except asyncio.CancelledError:
+                    pass
+            
+            # Fecha a sessão HTTP do Telegram (após o último envio)
+            if self.telegram:
+                await self.telegram.close()
+            
+            # Desconecta do MT5
+            if self.mt5_client:
+                await self.mt5_client.disconnect()
+            
+            logger.info("Shutdown concluído")
+        finally:
+            self._shutdown_done.set()
     
     async def run(self) -> None:
         """
@@ -525,6 +788,12 @@ class TradingBot:
             # Setup
             await self.setup()
             
+            # Move objetos de longa duração (modelo, módulos, configurações)
+            # para a geração permanente do GC: as coletas durante o loop
+            # deixam de percorrê-los a cada passada
+            gc.collect()
+            gc.freeze()
+            
             # Inicia Telegram em Background Task (Paralelo)
             if self.telegram and self.telegram.enabled:
                 logger.info("Iniciando serviço Telegram em background...")
@@ -7,10 +7,11 @@ Este módulo contém:
 - Validação multi-camada de trades
 """
 
-from risk.manager import KellyRiskManager
+from risk.manager import KellyRiskManager, lot_size_for_risk
 
 __all__ = [
     'KellyRiskManager',
+    'lot_size_for_risk',
 ]
 
 __version__ = '1.0.0'
@@ -7,6 +7,7 @@ Implementa:
 - Validação de exposição e limites de risco
 """
 
+import logging
 import math
 from typing import Dict, Any, Optional
 from core.logger import get_logger
@@ -14,6 +15,40 @@ from core.logger import get_logger
 logger = get_logger(__name__)
 
 
+def lot_size_for_risk(
+    risk_amount: float,
+    risk_for_one_lot: float,
+    volume_min: float,
+    volume_max: float,
+    step_recip: float
+) -> float:
+    """
+    Converte o capital em risco em volume (lotes) válido para o símbolo.
+    
+    Função puramente numérica, sem acesso ao MT5 nem a estado: pode ser
+    chamada em loops de backtest com os campos do símbolo já extraídos.
+    
+    Args:
+        risk_amount: Capital a arriscar (moeda da conta)
+        risk_for_one_lot: Risco de 1 lote até o stop loss (> 0)
+        volume_min: Volume mínimo do símbolo
+        volume_max: Volume máximo do símbolo
+        step_recip: Recíproco do step de volume (0 = sem arredondamento)
+        
+    Returns:
+        Volume arredondado ao step e limitado a [volume_min, volume_max]
+    """
+    volume = risk_amount / risk_for_one_lot
+    
+    if step_recip > 0:
+        # Para steps decimais (0.01, 0.1...) o recíproco é inteiro: o resultado
+        # é o float mais próximo do múltiplo decimal (0.07 e não
+        # 0.07000000000000001 como em round(v / step) * step)
+        volume = int(volume * step_recip + 0.5) / step_recip
+    
+    return min(volume_max, max(volume_min, volume))
+
+
 class KellyRiskManager:
     """
     Gestor de risco baseado no Critério de Kelly Fracionário.
@@ -56,6 +91,9 @@ class KellyRiskManager:
         self.min_kelly_exposure = min_kelly_exposure
         self.max_kelly_exposure = max_kelly_exposure
         
+        # Recíproco de cada step de volume já visto (step -> 1/step)
+        self._step_recip_cache: Dict[float, float] = {}
+        
         logger.info(
             f"KellyRiskManager inicializado - "
             f"Fração: {kelly_fraction}, Max Risk: {max_risk_per_trade*100:.1f}%, "
@@ -91,10 +129,11 @@ class KellyRiskManager:
         fractional_kelly = max(self.min_kelly_exposure, fractional_kelly)
         fractional_kelly = min(self.max_kelly_exposure, fractional_kelly)
         
-        logger.debug(
-            f"Kelly Calc - WinRate: {p:.2%}, Payoff: {b:.2f}, "
-            f"Full Kelly: {kelly:.2%}, Fractional: {fractional_kelly:.2%}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Kelly Calc - WinRate: {p:.2%}, Payoff: {b:.2f}, "
+                f"Full Kelly: {kelly:.2%}, Fractional: {fractional_kelly:.2%}"
+            )
         
         return fractional_kelly
     
@@ -153,15 +192,14 @@ class KellyRiskManager:
         max_risk_amount = account_balance * self.max_risk_per_trade
         risk_amount = min(kelly_risk_amount, max_risk_amount)
         
-        # Calcula lote baseado no risco
-        calculated_volume = risk_amount / risk_for_one_lot
-        
-        # Arredonda para step do símbolo
-        volume = self._round_to_step(calculated_volume, volume_step)
-        
-        # Aplica limites de volume
-        volume = max(volume_min, volume)
-        volume = min(volume_max, volume)
+        # Calcula lote baseado no risco (arredondado ao step e limitado)
+        volume = lot_size_for_risk(
+            risk_amount,
+            risk_for_one_lot,
+            volume_min,
+            volume_max,
+            self._step_reciprocal(volume_step)
+        )
         
         # Recalcula risco real com volume ajustado
         actual_risk = volume * risk_for_one_lot
@@ -287,21 +325,21 @@ class KellyRiskManager:
             'risk_percentage': risk_pct
         }
     
-    def _round_to_step(self, value: float, step: float) -> float:
+    def _step_reciprocal(self, step: float) -> float:
         """
-        Arredonda valor para o step mais próximo.
-        
-        Args:
-            value: Valor a arredondar
-            step: Step de arredondamento
-            
-        Returns:
-            Valor arredondado
+        Retorna 1/step (0.0 para step inválido), calculado uma vez por step.
         """
-        if step == 0:
-            return value
-        
-        return round(value / step) * step
+        recip = self._step_recip_cache.get(step)
+        if recip is None:
+            if step <= 0:
+                recip = 0.0
+            else:
+                recip = 1.0 / step
+                # Steps decimais: elimina o erro de representação do recíproco
+                if abs(recip - round(recip)) < 1e-9 * recip:
+                    recip = float(round(recip))
+            self._step_recip_cache[step] = recip
+        return recip
     
     def _invalid_position(self) -> Dict[str, Any]:
         """
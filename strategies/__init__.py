@@ -5,9 +5,15 @@ Este módulo contém:
 - PrimaryStrategy: Seguidor de tendência (EMA + RSI)
 - MetaLabeler: RandomForest para meta-labeling
 - AITradingLogic: Orquestrador da IA
+
+As classes são carregadas sob demanda (PEP 562): importar o pacote não
+carrega scikit-learn/joblib/pandas_ta até o primeiro acesso a uma delas.
 """
 
-from strategies.ai_logic import PrimaryStrategy, MetaLabeler, AITradingLogic
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from strategies.ai_logic import PrimaryStrategy, MetaLabeler, AITradingLogic
 
 __all__ = [
     'PrimaryStrategy',
@@ -16,3 +22,15 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        from strategies import ai_logic
+
+        value = getattr(ai_logic, name)
+        # Próximos acessos não passam mais por __getattr__
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
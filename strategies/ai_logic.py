@@ -20,6 +20,8 @@ Melhorias v3.0
 """
 
 import warnings
+import logging
+import math
 import os
 
 os.environ["PYTHONWARNINGS"] = "ignore"
@@ -103,8 +105,6 @@ class BarrierLabeler:
             logger.error("BarrierLabeler: coluna 'atr' ausente. Impossível calcular barreiras.")
             return pd.Series(index=df.index, data=np.nan)
 
-        labels = pd.Series(index=df.index, data=np.nan)
-
         # Arrays NumPy para performance em loops grandes
         highs  = df['high'].values
         lows   = df['low'].values
@@ -112,6 +112,10 @@ class BarrierLabeler:
         atrs   = df['atr'].values
         n      = len(df)
 
+        # Labels escritos no array e convertidos em Series uma única vez
+        # (sem Series.iloc por barra)
+        label_values = np.full(n, np.nan)
+
         wins = losses = timeouts = 0
 
         for i in range(n - self.max_bars):
@@ -169,7 +173,7 @@ class BarrierLabeler:
             else:
                 losses += 1
 
-            labels.iloc[i] = outcome
+            label_values[i] = outcome
 
         total = wins + losses + timeouts
         if total > 0:
@@ -182,7 +186,7 @@ class BarrierLabeler:
         else:
             logger.warning("BarrierLabeler: nenhuma barra pôde ser rotulada (ATR inválido?).")
 
-        return labels
+        return pd.Series(label_values, index=df.index)
 
 
 # ---------------------------------------------------------------------------
@@ -204,6 +208,9 @@ class PrimaryStrategy:
         esse parâmetro, então o sistema continua funcionando sem alterações.
     """
 
+    # Colunas obrigatórias (calculadas pelo FeatureEngine), na ordem de leitura
+    REQUIRED_COLUMNS = ('close', 'ema', 'rsi', 'atr', 'adx', 'macd', 'macd_signal')
+
     def __init__(
         self,
         ema_period: int       = 200,
@@ -247,51 +254,97 @@ class PrimaryStrategy:
                 f"({len(df)} barras disponíveis)"
             )
 
-        bar = df.iloc[-1]
-
-        # Valida todas as colunas obrigatórias (calculadas pelo FeatureEngine)
-        required = ['close', 'ema', 'rsi', 'atr', 'adx', 'macd', 'macd_signal']
-        for col in required:
-            if col not in bar.index or pd.isna(bar[col]):
+        # Valida todas as colunas obrigatórias (calculadas pelo FeatureEngine).
+        # Lê apenas o último valor de cada coluna direto do array NumPy, sem
+        # materializar a linha inteira como Series (df.iloc[-1])
+        columns = df.columns
+        values = []
+        for col in self.REQUIRED_COLUMNS:
+            if col not in columns:
+                return self._hold(f"Indicador ausente ou NaN: '{col}'")
+            value = float(df[col].to_numpy()[-1])
+            if math.isnan(value):
                 return self._hold(f"Indicador ausente ou NaN: '{col}'")
+            values.append(value)
+
+        close, ema, rsi, atr, adx, macd, macd_signal = values
 
-        close       = bar['close']
-        ema         = bar['ema']
-        rsi         = bar['rsi']
-        atr         = bar['atr']
-        adx         = bar['adx']
-        macd        = bar['macd']
-        macd_signal = bar['macd_signal']
+        # Mesmas máscaras de generate_signals_batch, avaliadas só na última barra
+        buy, sell = self._entry_masks(close, ema, rsi, adx, macd, macd_signal)
+
+        if buy:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Sinal BUY | Close: {close:.5f} > EMA: {ema:.5f} | "
+                    f"ADX: {adx:.1f} | MACD: {macd:.5f} > Sig: {macd_signal:.5f} | "
+                    f"RSI: {rsi:.1f}"
+                )
+            return self._signal('BUY', 1, close, atr, ema, rsi, adx)
+
+        if sell:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Sinal SELL | Close: {close:.5f} < EMA: {ema:.5f} | "
+                    f"ADX: {adx:.1f} | MACD: {macd:.5f} < Sig: {macd_signal:.5f} | "
+                    f"RSI: {rsi:.1f}"
+                )
+            return self._signal('SELL', -1, close, atr, ema, rsi, adx)
 
-        # ── FILTRO 1: Tendência real (ADX) ───────────────────────────────────
-        # Elimina a maioria das entradas ruins em mercados laterais
         if adx < self.adx_threshold:
             return self._hold(
                 f"Mercado lateral (ADX={adx:.1f} < {self.adx_threshold:.1f}). "
                 f"Aguardando tendência."
             )
 
-        # ── FILTRO 2 + 3 + 4: Direção + Momentum + RSI ───────────────────────
+        return self._hold("Indicadores não alinhados. Aguardando confluência.")
 
-        # COMPRA: preço acima da EMA + MACD confirmando + RSI sem sobrecompra
-        if close > ema and macd > macd_signal and rsi < self.rsi_overbought:
-            logger.debug(
-                f"Sinal BUY | Close: {close:.5f} > EMA: {ema:.5f} | "
-                f"ADX: {adx:.1f} | MACD: {macd:.5f} > Sig: {macd_signal:.5f} | "
-                f"RSI: {rsi:.1f}"
-            )
-            return self._signal('BUY', 1, close, atr, ema, rsi, adx)
+    def generate_signals_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Avalia as regras de entrada em todas as barras de uma vez
+        (vetorizado), para backtests e varreduras históricas.
 
-        # VENDA: preço abaixo da EMA + MACD confirmando + RSI sem sobrevenda
-        if close < ema and macd < macd_signal and rsi > self.rsi_oversold:
-            logger.debug(
-                f"Sinal SELL | Close: {close:.5f} < EMA: {ema:.5f} | "
-                f"ADX: {adx:.1f} | MACD: {macd:.5f} < Sig: {macd_signal:.5f} | "
-                f"RSI: {rsi:.1f}"
-            )
-            return self._signal('SELL', -1, close, atr, ema, rsi, adx)
+        Usa as mesmas máscaras de generate_signal (_entry_masks). Barras
+        com indicador ou ATR NaN resultam em 0 (comparações com NaN são
+        falsas), assim como as barras iniciais sem EMA completa.
 
-        return self._hold("Indicadores não alinhados. Aguardando confluência.")
+        Returns:
+            Array int8 com o lado de cada barra: 1 (BUY), -1 (SELL), 0 (HOLD).
+            Use np.flatnonzero(sides) para obter os índices dos sinais.
+        """
+        sides = np.zeros(len(df), dtype=np.int8)
+
+        columns = df.columns
+        if len(df) < self.ema_period or any(col not in columns for col in self.REQUIRED_COLUMNS):
+            return sides
+
+        close, ema, rsi, atr, adx, macd, macd_signal = (
+            df[col].to_numpy(dtype=np.float64) for col in self.REQUIRED_COLUMNS
+        )
+
+        buy, sell = self._entry_masks(close, ema, rsi, adx, macd, macd_signal)
+
+        # ATR NaN também vira HOLD (SL/TP não seriam calculáveis)
+        valid_atr = ~np.isnan(atr)
+        sides[buy & valid_atr]  = 1
+        sides[sell & valid_atr] = -1
+        # Mesma restrição de generate_signal: exige histórico para a EMA
+        sides[:self.ema_period - 1] = 0
+        return sides
+
+    def _entry_masks(self, close, ema, rsi, adx, macd, macd_signal):
+        """
+        Regras de entrada (única definição), válidas para escalares ou arrays.
+
+        FILTRO 1 — ADX: tendência real (elimina mercados laterais)
+        FILTROS 2 + 3 + 4 — Direção (EMA) + Momentum (MACD) + RSI fora da exaustão
+
+        Returns:
+            Tupla (compra, venda) de booleanos ou máscaras booleanas
+        """
+        trending = adx >= self.adx_threshold
+        buy  = trending & (close > ema) & (macd > macd_signal) & (rsi < self.rsi_overbought)
+        sell = trending & (close < ema) & (macd < macd_signal) & (rsi > self.rsi_oversold)
+        return buy, sell
 
     # ── Helpers ──────────────────────────────────────────────────────────────
 
@@ -305,8 +358,9 @@ class PrimaryStrategy:
         rsi: float,
         adx: float,
     ) -> Dict[str, Any]:
-        sl = close - (self.sl_atr_mult * atr) if side == 1 else close + (self.sl_atr_mult * atr)
-        tp = close + (self.tp_atr_mult * atr) if side == 1 else close - (self.tp_atr_mult * atr)
+        # side = ±1: o sinal do deslocamento segue a direção do trade
+        sl = close - side * (self.sl_atr_mult * atr)
+        tp = close + side * (self.tp_atr_mult * atr)
 
         # Confiança técnica heurística (0.1 a 0.99)
         dist_ema  = abs(close - ema) / max(atr, 1e-9)
@@ -329,7 +383,7 @@ class PrimaryStrategy:
         }
 
     def _hold(self, reason: str = "") -> Dict[str, Any]:
-        if reason:
+        if reason and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"PrimaryStrategy → HOLD | {reason}")
         return {
             'action'      : 'HOLD',
@@ -504,7 +558,9 @@ class MetaLabeler:
         self.feature_columns = available
 
         # 3. Montagem de X e y
-        X = df[available].values
+        # float32: as árvores do scikit-learn convertem X para float32
+        # internamente; montar já nesse dtype evita a cópia em float64
+        X = df[available].to_numpy(dtype=np.float32)
         y = labels.values
 
         valid = ~np.isnan(X).any(axis=1) & ~np.isnan(y)
@@ -588,19 +644,23 @@ class MetaLabeler:
             logger.warning("MetaLabeler: DataFrame vazio na predição. Retornando 0.5.")
             return 0.5
 
-        current = df.iloc[-1]
-
         try:
-            X = np.array([[current[col] for col in self.feature_columns]])
+            # Último valor de cada coluna direto do array (sem df.iloc[-1],
+            # que materializa a linha inteira como Series)
+            X = np.array(
+                [[df[col].to_numpy()[-1] for col in self.feature_columns]],
+                dtype=np.float32
+            )
 
             if np.isnan(X).any():
-                nan_cols = [
-                    col for col, val in zip(self.feature_columns, X[0])
-                    if np.isnan(val)
-                ]
-                logger.debug(
-                    f"MetaLabeler: NaN nas features {nan_cols}. Retornando 0.5."
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    nan_cols = [
+                        col for col, val in zip(self.feature_columns, X[0])
+                        if np.isnan(val)
+                    ]
+                    logger.debug(
+                        f"MetaLabeler: NaN nas features {nan_cols}. Retornando 0.5."
+                    )
                 return 0.5
 
             proba = float(self.model.predict_proba(X)[0][1])
@@ -737,8 +797,9 @@ class AITradingLogic:
             Campos garantidos: 'action', 'side', 'meta_approved', 'meta_probability'.
         """
         # Passo 1: Enriquecimento de dados (FeatureEngine)
+        # df_ind é intermediário local: dispensa a segunda cópia
         df_ind  = self.feature_engine.calculate_indicators(df)
-        df_feat = self.feature_engine.create_ml_features(df_ind)
+        df_feat = self.feature_engine.create_ml_features(df_ind, copy=False)
 
         # Passo 2: Estratégia Primária (Análise Técnica)
         signal = self.primary_strategy.generate_signal(df_feat)
@@ -12,14 +12,13 @@ Uso Automático:
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
 # Adiciona diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core import configure_logging_from_config, get_logger, MT5Client
+from core import configure_logging_from_config, get_logger, load_config, MT5Client
 from data import FeatureEngine
 from strategies import MetaLabeler
 
@@ -52,8 +51,7 @@ async def train_meta_model(
         logger.info("=" * 80)
     
     # Carrega configurações
-    with open("config/settings.json", 'r') as f:
-        config = json.load(f)
+    config = load_config("config/settings.json")
     
     # Inicializa MT5
     mt5_config = config['mt5']
@@ -95,8 +93,8 @@ async def train_meta_model(
             atr_period=strategy_config['atr_period']
         )
         
-        df = engine.calculate_indicators(df)
-        df = engine.create_ml_features(df)
+        df = engine.calculate_indicators(df, copy=False)
+        df = engine.create_ml_features(df, copy=False)
         
         if not silent:
             logger.info(f"✓ Features calculadas: {len(df.columns)} colunas")